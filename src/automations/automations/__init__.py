@@ -1,5 +1,6 @@
 from .base import Automation
 from .daily_repo_maintain import DailyRepoMaintainAutomation
+from .essay_export import EssayExportAutomation
 from .git_commit_tracker import GitCommitTrackerAutomation
 from .obsidian_md_count import ObsidianMarkdownCountAutomation
 from .obsidian_edit_tracker import ObsidianEditTrackerAutomation
@@ -10,15 +11,18 @@ from .unedited_kindle_notes import UneditedKindleNotesAutomation
 from .wallpaper_from_report import WallpaperFromReportAutomation
 from .weekly_commit_tracker import WeeklyCommitTrackerAutomation
 from .project_command_center import ProjectCommandCenterAutomation
+from .project_cards import ProjectCardsAutomation
 from .telegram_idea import TelegramIdeaAutomation
 from .weekly_focus import WeeklyFocusAutomation
 
 __all__ = [
     "Automation",
     "DailyRepoMaintainAutomation",
+    "EssayExportAutomation",
     "GitCommitTrackerAutomation",
     "ObsidianMarkdownCountAutomation",
     "ObsidianEditTrackerAutomation",
+    "ProjectCardsAutomation",
     "ProjectCommandCenterAutomation",
     "ProgressToHundredAutomation",
     "PublishPortfolioFromObsAutomation",
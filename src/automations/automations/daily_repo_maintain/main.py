@@ -6,6 +6,7 @@ from typing import Any
 from ..base import Automation
 from ...context import AutomationContext
 from ...models import AutomationSpec
+from ...services.github import resolve_github_identities
 
 
 class DailyRepoMaintainAutomation(Automation):
@@ -20,19 +21,17 @@ class DailyRepoMaintainAutomation(Automation):
         if cached:
             return {"repo": cached.get("repo", ""), "cached": True}
 
-        shared = ctx.config.settings
-        service_cfg = ctx.services.service_config("github")
-        username = shared.get("github_username") or service_cfg.get("username")
-        token = shared.get("github_token") or service_cfg.get("token")
-        if not username or not token:
+        identities = resolve_github_identities(
+            ctx.config.settings, ctx.services.service_config("github")
+        )
+        if not identities:
             return {"repo": ""}
 
-        client = ctx.services.github_client(username=str(username), token=str(token))
-        repos = client.list_active_repos()
+        repos = ctx.services.github_catalog(identities).active_repos()
         if not repos:
             return {"repo": ""}
 
         chosen = random.choice(repos)
-        repo_name = chosen.get("name", "")
+        repo_name = chosen.name
         ctx.log.append(self.spec.id, "repo_chosen", {"repo": repo_name})
         return {"repo": repo_name, "cached": False}
@@ -0,0 +1,3 @@
+from .main import EssayExportAutomation
+
+__all__ = ["EssayExportAutomation"]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+from typing import Any
+from urllib.parse import quote
+
+from ..base import Automation
+from ...context import AutomationContext
+from ...models import AutomationSpec
+from ...output_writer import write_json_atomic
+from ...services.asset_sync import sync_assets
+from ...services.obsidian import index_media, scan_notes
+from .render import EssayJob, render_essays
+
+# Bump when the HTML output changes, so every essay is re-rendered once
+RENDER_VERSION = 1
+MANIFEST_VERSION = 1
+
+
+class EssayExportAutomation(Automation):
+    spec = AutomationSpec(
+        id="essay_export",
+        title="Essay Export",
+        description="Export vault notes matching essay_include_string to HTML, with their embedded media.",
+        feeds_dashboard=False,
+    )
+
+    def run(self, ctx: AutomationContext) -> dict[str, Any]:
+        settings = ctx.config.settings
+        vault_path = Path(str(settings["vault_path"])).expanduser()
+        include = str(settings.get("essay_include_string") or "")
+        if not include:
+            raise ValueError("essay_export requires 'essay_include_string' in config.yaml")
+        output_folder = _resolve_required(ctx, "essay_output_folder")
+        media_folder = _resolve_required(ctx, "essay_media_folder")
+        vault_media = Path(str(settings.get("vault_media_path") or vault_path)).expanduser()
+
+        manifest_path = ctx.config.cache_root / self.spec.id / "manifest.json"
+        manifest = _load_manifest(manifest_path)
+        # Cached selections are only valid for the include string they were made with
+        known_notes = manifest.get("notes", {}) if manifest.get("include") == include else {}
+        notes = scan_notes(vault_path, include, known_notes)
+        essays = {path: info for path, info in notes.items() if info["selected"]}
+        slugs = {Path(path).stem.lower(): _slug(Path(path).stem) for path in essays}
+
+        media_index = index_media(vault_media)
+        media_used: dict[str, Path] = {}
+        outputs: dict[str, str] = {}
+        pending: list[EssayJob] = []
+        unchanged = 0
+
+        for path, info in sorted(essays.items()):
+            slug = slugs[Path(path).stem.lower()]
+            links = {target: (f"{slugs[target]}.html" if target in slugs else None) for target in info["links"]}
+            media: dict[str, str | None] = {}
+            media_stats: list[Any] = []
+            for target in info["embeds"]:
+                source = media_index.get(Path(target).name.lower())
+                if source is None:
+                    if target in slugs:
+                        links[target] = f"{slugs[target]}.html"
+                    else:
+                        media[target] = None
+                    continue
+                media_used[source.name] = source
+                media[target] = _media_href(output_folder, media_folder, source.name)
+                stat = source.stat()
+                media_stats.append([target, stat.st_size, stat.st_mtime_ns])
+
+            key = _essay_key(info, links, media, media_stats)
+            outputs[slug] = key
+            dest = output_folder / f"{slug}.html"
+            if manifest.get("outputs", {}).get(slug) == key and dest.exists():
+                unchanged += 1
+                continue
+            pending.append(EssayJob(source=Path(path), dest=dest, title=info["title"], links=links, media=media))
+
+        # Only media this exporter put there is pruned; the folder may hold other files
+        media_sync = sync_assets(media_used, media_folder, known=manifest.get("media", []))
+        for name, error in media_sync.failed.items():
+            ctx.log.append(self.spec.id, "media_error", {"file": name, "error": error})
+
+        failed: dict[str, str] = {}
+        workers = int(settings["essay_workers"]) if settings.get("essay_workers") else None
+        for job, page in zip(pending, render_essays(pending, workers) if pending else []):
+            error: str | None = None
+            if isinstance(page, Exception):
+                error = f"{type(page).__name__}: {page}"
+            else:
+                try:
+                    ctx.output.write_text(job.dest, page)
+                except OSError as e:
+                    error = f"{type(e).__name__}: {e}"
+            if error is not None:
+                failed[job.source.name] = error
+                # No stored key, so the essay is rendered again next run; its old HTML is kept
+                outputs.pop(job.dest.stem, None)
+                ctx.log.append(self.spec.id, "render_error", {"note": job.source.name, "error": error})
+
+        removed = _remove_stale(output_folder, set(manifest.get("outputs", {})) - set(slugs.values()))
+
+        _save_manifest(manifest_path, {
+            "version": MANIFEST_VERSION,
+            "include": include,
+            "notes": notes,
+            "outputs": outputs,
+            "media": sorted(media_used),
+        })
+
+        return {
+            "essays": len(essays),
+            "rendered": len(pending) - len(failed),
+            "unchanged": unchanged,
+            "failed": len(failed),
+            "media_synced": len(media_sync.synced),
+            "media_unchanged": len(media_sync.unchanged),
+            "removed": removed + len(media_sync.removed),
+        }
+
+
+def _essay_key(
+    info: dict[str, Any],
+    links: dict[str, str | None],
+    media: dict[str, str | None],
+    media_stats: list[Any],
+) -> str:
+    """Hash of everything an essay's HTML depends on: its text, link targets and media."""
+    payload = json.dumps(
+        [RENDER_VERSION, info["sha256"], info["title"], links, media, media_stats],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _remove_stale(output_folder: Path, stale_slugs: set[str]) -> int:
+    for slug in stale_slugs:
+        (output_folder / f"{slug}.html").unlink(missing_ok=True)
+    return len(stale_slugs)
+
+
+def _media_href(output_folder: Path, media_folder: Path, name: str) -> str:
+    relative = os.path.relpath(media_folder / name, output_folder)
+    return quote(relative.replace(os.sep, "/"))
+
+
+def _slug(stem: str) -> str:
+    return re.sub(r"[^\w]+", "-", stem.lower()).strip("-_") or "essay"
+
+
+def _resolve_required(ctx: AutomationContext, key: str) -> Path:
+    raw = ctx.config.settings.get(key)
+    if not raw:
+        raise ValueError(f"missing config key: {key}")
+    path = Path(str(raw)).expanduser()
+    if not path.is_absolute():
+        path = ctx.config.project_root / path
+    return path
+
+
+def _load_manifest(path: Path) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data
+
+
+def _save_manifest(path: Path, data: dict[str, Any]) -> None:
+    write_json_atomic(path, data)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import html
+import multiprocessing
+import os
+from pathlib import Path
+import re
+
+import markdown
+
+from ...report.templates import template_service
+from ...services.obsidian import WikiLink, replace_wikilinks, strip_frontmatter
+
+TEMPLATE_DIR = Path(__file__).parent
+MARKDOWN_EXTENSIONS = ["extra", "sane_lists"]
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".svg", ".avif"}
+
+
+@dataclass(frozen=True)
+class EssayJob:
+    source: Path
+    dest: Path
+    title: str
+    links: dict[str, str | None]  # lower-cased link target → href of the published essay, None if unpublished
+    media: dict[str, str | None]  # lower-cased embed target → href of the copied media file
+
+
+def render_essays(jobs: list[EssayJob], workers: int | None = None) -> list[str | Exception]:
+    """Render essays to HTML, in a process pool when there is more than one.
+
+    Returns each page, or the exception that stopped it; writing is left to the caller.
+    """
+    if len(jobs) == 1 or workers == 1:
+        return [_safe_render(job) for job in jobs]
+    max_workers = min(len(jobs), workers or os.cpu_count() or 1)
+    # Called from runner worker threads: a forked child could inherit a lock held by another thread
+    context = multiprocessing.get_context("forkserver")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+        return list(pool.map(_safe_render, jobs))
+
+
+def render_essay(job: EssayJob) -> str:
+    body = strip_frontmatter(job.source.read_text(encoding="utf-8"))
+    body = replace_wikilinks(body, lambda link: _resolve(link, job))
+    content = markdown.markdown(body, extensions=MARKDOWN_EXTENSIONS)
+    return template_service().render(TEMPLATE_DIR, "essay_template.html", title=job.title, content=content)
+
+
+def _safe_render(job: EssayJob) -> str | Exception:
+    try:
+        return render_essay(job)
+    except Exception as e:
+        return e
+
+
+def _resolve(link: WikiLink, job: EssayJob) -> str:
+    key = link.target.lower()
+    if link.embed and key in job.media:
+        href = job.media[key]
+        if href is None:
+            return ""
+        if Path(link.target).suffix.lower() not in IMAGE_SUFFIXES:
+            return f'<a href="{html.escape(href)}">{html.escape(link.alias or Path(link.target).name)}</a>'
+        # ![[image.png|300]] sets the width; any other alias is alt text
+        width = f' width="{link.alias}"' if re.fullmatch(r"\d+", link.alias) else ""
+        alt = "" if width else link.alias
+        return f'<img src="{html.escape(href)}" alt="{html.escape(alt)}"{width}>'
+    href = job.links.get(key)
+    label = _escape_markdown(link.label)
+    if href is None:
+        return label
+    return f"[{label}]({href})"
+
+
+def _escape_markdown(text: str) -> str:
+    return re.sub(r"([\\\[\]*_`])", r"\\\1", text)
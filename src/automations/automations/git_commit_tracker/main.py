@@ -8,6 +8,7 @@ from typing import Any
 from ..base import Automation
 from ...context import AutomationContext
 from ...models import AutomationResult, AutomationSpec
+from ...output_writer import OutputWriter
 
 
 class GitCommitTrackerAutomation(Automation):
@@ -51,7 +52,7 @@ class GitCommitTrackerAutomation(Automation):
         # Generate SVG visualization
         output_dir = Path("/home/brokkoli/GITHUB/automations/output")
         output_dir.mkdir(parents=True, exist_ok=True)
-        svg_path = _generate_svg(daily_commits, output_dir)
+        svg_path = _generate_svg(daily_commits, output_dir, ctx.output)
 
         return {
             "repo_count": len(repos),
@@ -115,7 +116,7 @@ def _aggregate_commits(repos: list[Path]) -> dict[str, int]:
     return aggregated
 
 
-def _generate_svg(daily_commits: dict[str, int], output_dir: Path) -> Path:
+def _generate_svg(daily_commits: dict[str, int], output_dir: Path, output: OutputWriter) -> Path:
     """Generate GitHub-style contribution graph SVG."""
     # Calculate the last 14 days
     today = datetime.now().date()
@@ -142,7 +143,7 @@ def _generate_svg(daily_commits: dict[str, int], output_dir: Path) -> Path:
 
     # Save to file
     svg_path = output_dir / "git_commit_tracker.svg"
-    svg_path.write_text(svg_content, encoding="utf-8")
+    output.write_text(svg_path, svg_content)
 
     return svg_path
 
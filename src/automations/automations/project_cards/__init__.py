@@ -0,0 +1,3 @@
+from .main import ProjectCardsAutomation
+
+__all__ = ["ProjectCardsAutomation"]
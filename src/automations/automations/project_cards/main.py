@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from ..base import Automation
+from ...context import AutomationContext
+from ...models import AutomationSpec
+from .render import CardJob, sync_project_cards
+
+
+class ProjectCardsAutomation(Automation):
+    spec = AutomationSpec(
+        id="project_cards",
+        title="Project Cards",
+        description="Render a PNG card per project from the project_command_center export.",
+        feeds_dashboard=False,
+    )
+
+    def run(self, ctx: AutomationContext) -> dict[str, Any]:
+        settings = ctx.config.settings
+        data_folder = _resolve_required(ctx, "project_output_data_folder")
+        img_folder = _resolve_required(ctx, "project_data_output_img_folder")
+        output_folder = _resolve_required(ctx, "project_cards_output_folder")
+
+        jobs = []
+        for data_path in sorted(data_folder.glob("*.json")):
+            project_id = data_path.stem
+            image_path = img_folder / f"{project_id}.webp"
+            jobs.append(CardJob(
+                project_id=project_id,
+                data_path=data_path,
+                image_path=image_path if image_path.exists() else None,
+                dest=output_folder / f"{project_id}.png",
+            ))
+
+        result = sync_project_cards(
+            jobs,
+            output_folder=output_folder,
+            manifest_path=ctx.config.cache_root / self.spec.id / "cards.json",
+            workers=int(settings["project_cards_workers"]) if settings.get("project_cards_workers") else None,
+            output=ctx.output,
+        )
+        for project_id, error in result.failed.items():
+            ctx.log.append(self.spec.id, "card_error", {"id": project_id, "error": error})
+
+        return {
+            "cards": len(jobs),
+            "rendered": len(result.rendered),
+            "unchanged": len(result.unchanged),
+            "failed": len(result.failed),
+            "removed": len(result.removed),
+        }
+
+
+def _resolve_required(ctx: AutomationContext, key: str) -> Path:
+    raw = ctx.config.settings.get(key)
+    if not raw:
+        raise ValueError(f"missing config key: {key}")
+    path = Path(str(raw)).expanduser()
+    if not path.is_absolute():
+        path = ctx.config.project_root / path
+    return path
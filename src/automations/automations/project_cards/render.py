@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import hashlib
+from io import BytesIO
+import json
+import multiprocessing
+import os
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, ImageDraw, ImageOps
+
+from ...output_writer import OutputWriter, write_json_atomic
+from ...report.raster import load_font
+
+CARD_WIDTH = 800
+CARD_HEIGHT = 600
+IMAGE_HEIGHT = 300
+PADDING = 32
+DESCRIPTION_MAX_LINES = 3
+# Bump when the card layout changes, so every cached card is redrawn
+RENDER_VERSION = 1
+MANIFEST_VERSION = 1
+
+BACKGROUND = "#111827"
+IMAGE_PLACEHOLDER = "#1e293b"
+TITLE = "#f1f5f9"
+TEXT = "#94a3b8"
+MUTED = "#64748b"
+BADGE_COLORS = {"archived": "#64748b", "showcase": "#a78bfa", "failed": "#f87171"}
+
+
+@dataclass(frozen=True)
+class CardJob:
+    project_id: str
+    data_path: Path
+    image_path: Path | None
+    dest: Path
+
+
+@dataclass
+class CardSyncResult:
+    rendered: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)  # project_id → error
+    removed: list[str] = field(default_factory=list)
+
+
+def sync_project_cards(
+    jobs: list[CardJob],
+    output_folder: Path,
+    manifest_path: Path,
+    workers: int | None = None,
+    output: OutputWriter | None = None,
+) -> CardSyncResult:
+    """Render a PNG card per project, skipping cards whose data and image are unchanged.
+
+    Each card is keyed by the hash of its JSON, the hash of its image and the layout
+    version; only cards whose key changed (or whose PNG is missing) are drawn, in a
+    process pool and written through ``output``. Cards of projects that disappeared are
+    deleted.
+    """
+    output = output or OutputWriter()
+    manifest = _load_manifest(manifest_path)
+    result = CardSyncResult()
+    next_manifest: dict[str, str] = {}
+    pending: list[tuple[CardJob, str]] = []
+
+    for job in jobs:
+        try:
+            key = _card_key(job)
+        except OSError as e:
+            result.failed[job.project_id] = str(e)
+            continue
+        if manifest.get(job.project_id) == key and job.dest.exists():
+            next_manifest[job.project_id] = key
+            result.unchanged.append(job.project_id)
+            continue
+        pending.append((job, key))
+
+    if pending:
+        outcomes = _run_renders([job for job, _ in pending], workers)
+        for (job, key), outcome in zip(pending, outcomes):
+            try:
+                if isinstance(outcome, Exception):
+                    raise outcome
+                output.write_bytes(job.dest, outcome)
+            except Exception as e:
+                result.failed[job.project_id] = f"{type(e).__name__}: {e}"
+                continue
+            next_manifest[job.project_id] = key
+            result.rendered.append(job.project_id)
+
+    current = {job.project_id for job in jobs}
+    for project_id in sorted(set(manifest) - current):
+        (output_folder / f"{project_id}.png").unlink(missing_ok=True)
+        result.removed.append(project_id)
+
+    if next_manifest != manifest:
+        _save_manifest(manifest_path, next_manifest)
+    return result
+
+
+def render_card(data: dict[str, Any], image_path: Path | None) -> Image.Image:
+    """Draw one project card: image on top, then title, description, badges and links."""
+    card = Image.new("RGB", (CARD_WIDTH, CARD_HEIGHT), BACKGROUND)
+    draw = ImageDraw.Draw(card)
+
+    header = _load_header(image_path)
+    if header is not None:
+        card.paste(header, (0, 0))
+    else:
+        draw.rectangle((0, 0, CARD_WIDTH, IMAGE_HEIGHT - 1), fill=IMAGE_PLACEHOLDER)
+
+    x = PADDING
+    y = IMAGE_HEIGHT + 24
+    title_font = load_font(34, bold=True)
+    title = _ellipsize(draw, str(data.get("name", "")), title_font, CARD_WIDTH - 2 * PADDING)
+    draw.text((x, y), title, font=title_font, fill=TITLE)
+    y += 48
+
+    text_font = load_font(19)
+    lines = _wrap(draw, str(data.get("description", "")), text_font, CARD_WIDTH - 2 * PADDING)
+    if len(lines) > DESCRIPTION_MAX_LINES:
+        lines = lines[:DESCRIPTION_MAX_LINES]
+        lines[-1] = _ellipsize(draw, lines[-1] + " …", text_font, CARD_WIDTH - 2 * PADDING)
+    for line in lines:
+        draw.text((x, y), line, font=text_font, fill=TEXT)
+        y += 27
+
+    badge_font = load_font(13, bold=True)
+    badges = [key for key in ("showcase", "archived") if data.get(key)]
+    if data.get("failed"):
+        badges.append("failed")
+    badge_x = x
+    badge_y = CARD_HEIGHT - PADDING - 22 - (28 if data.get("links") else 0)
+    for badge in badges:
+        label = badge.upper()
+        if badge == "failed":
+            label = _ellipsize(draw, f"FAILED: {data['failed']}", badge_font, CARD_WIDTH - PADDING - badge_x - 20)
+        width = draw.textlength(label, font=badge_font) + 20
+        draw.rounded_rectangle(
+            (badge_x, badge_y, badge_x + width, badge_y + 22),
+            radius=6,
+            outline=BADGE_COLORS[badge],
+            width=2,
+        )
+        draw.text((badge_x + 10, badge_y + 4), label, font=badge_font, fill=BADGE_COLORS[badge])
+        badge_x += width + 8
+
+    links = data.get("links")
+    if isinstance(links, dict) and links:
+        link_font = load_font(15)
+        text = _ellipsize(draw, "  ·  ".join(str(title) for title in links), link_font, CARD_WIDTH - 2 * PADDING)
+        draw.text((x, CARD_HEIGHT - PADDING - 18), text, font=link_font, fill=MUTED)
+    return card
+
+
+def _render_png(data_path: Path, image_path: Path | None) -> bytes | Exception:
+    """Worker entry point: a card encoded as PNG, or the exception that stopped it."""
+    try:
+        data = json.loads(data_path.read_text(encoding="utf-8"))
+        card = render_card(data, image_path)
+        buffer = BytesIO()
+        card.save(buffer, "PNG", compress_level=1)
+    except Exception as e:
+        return e
+    return buffer.getvalue()
+
+
+def _run_renders(jobs: list[CardJob], workers: int | None) -> list[bytes | Exception]:
+    if len(jobs) == 1 or workers == 1:
+        return [_render_png(job.data_path, job.image_path) for job in jobs]
+    max_workers = min(len(jobs), workers or os.cpu_count() or 1)
+    # forkserver, not fork: this runs on a runner worker thread
+    context = multiprocessing.get_context("forkserver")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+        futures = [pool.submit(_render_png, job.data_path, job.image_path) for job in jobs]
+        return [future.result() for future in futures]
+
+
+def _card_key(job: CardJob) -> str:
+    digest = hashlib.sha256(f"v{RENDER_VERSION}:{CARD_WIDTH}x{CARD_HEIGHT}\n".encode("utf-8"))
+    digest.update(job.data_path.read_bytes())
+    if job.image_path is not None:
+        digest.update(b"\nimage\n")
+        with job.image_path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_header(image_path: Path | None) -> Image.Image | None:
+    if image_path is None:
+        return None
+    try:
+        with Image.open(image_path) as image:
+            image.draft("RGB", (CARD_WIDTH, IMAGE_HEIGHT))
+            return ImageOps.fit(image.convert("RGB"), (CARD_WIDTH, IMAGE_HEIGHT), Image.Resampling.LANCZOS)
+    except OSError:
+        return None
+
+
+def _wrap(draw: ImageDraw.ImageDraw, text: str, font: Any, max_width: float) -> list[str]:
+    lines: list[str] = []
+    current = ""
+    for word in text.split():
+        candidate = f"{current} {word}" if current else word
+        if current and draw.textlength(candidate, font=font) > max_width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    if current:
+        lines.append(current)
+    return lines
+
+
+def _ellipsize(draw: ImageDraw.ImageDraw, text: str, font: Any, max_width: float) -> str:
+    if draw.textlength(text, font=font) <= max_width:
+        return text
+    while text and draw.textlength(text + "…", font=font) > max_width:
+        text = text[:-1]
+    return text.rstrip() + "…"
+
+
+def _load_manifest(path: Path) -> dict[str, str]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    cards = data.get("cards")
+    return cards if isinstance(cards, dict) else {}
+
+
+def _save_manifest(path: Path, cards: dict[str, str]) -> None:
+    write_json_atomic(path, {"version": MANIFEST_VERSION, "cards": cards}, indent=2)
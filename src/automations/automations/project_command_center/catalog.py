@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any
+
+import jsonschema
+
+from ...output_writer import write_json_atomic
+
+HEADING_RE = re.compile(r"^#{1,6}\s+(.+)$")
+
+_SCHEMA_PATH = Path(__file__).parent / "project_json_schema.json"
+_SCHEMA_BYTES = _SCHEMA_PATH.read_bytes()
+_SCHEMA: dict[str, Any] = json.loads(_SCHEMA_BYTES)
+# Stored verdicts are only valid for the schema they were checked against
+_SCHEMA_HASH = hashlib.sha256(_SCHEMA_BYTES).hexdigest()
+_VALIDATOR: Any = None
+
+IMAGE_RE = re.compile(r"!\[[^\]]*\]\(([^)]+)\)", re.IGNORECASE)
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".tiff", ".tif", ".avif"}
+
+
+@dataclass(frozen=True)
+class IssueRecord:
+    repo: str
+    title: str
+    file: Path
+    mtime: datetime
+
+
+class IssueTitleCache:
+    """Issue titles keyed by (path, mtime_ns, size), persisted between runs."""
+
+    def __init__(self, path: Path | None) -> None:
+        self._path = path
+        self._entries: dict[str, list[Any]] = {}
+        self._seen: set[str] = set()
+        self._dirty = False
+        if path is not None:
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (FileNotFoundError, json.JSONDecodeError, OSError):
+                data = {}
+            if isinstance(data, dict):
+                self._entries = data
+
+    def title(self, md: Path, stat: os.stat_result) -> str:
+        key = str(md)
+        self._seen.add(key)
+        cached = self._entries.get(key)
+        if cached is not None and cached[:2] == [stat.st_mtime_ns, stat.st_size]:
+            return cached[2]
+        title = _read_first_heading(md) or md.stem
+        self._entries[key] = [stat.st_mtime_ns, stat.st_size, title]
+        self._dirty = True
+        return title
+
+    def save(self) -> None:
+        """Persist the cache, dropping files that were not seen in this pass."""
+        stale = set(self._entries) - self._seen
+        if self._path is None or not (self._dirty or stale):
+            return
+        for key in stale:
+            del self._entries[key]
+        write_json_atomic(self._path, self._entries)
+        self._dirty = False
+
+
+class SchemaVerdictCache:
+    """Schema errors keyed by the sha256 of a project.json's bytes, persisted between runs.
+
+    The file is tagged with the hash of project_json_schema.json; when the schema
+    changes, every stored verdict is dropped.
+    """
+
+    def __init__(self, path: Path | None) -> None:
+        self._path = path
+        self._verdicts: dict[str, list[str]] = {}
+        self._seen: set[str] = set()
+        self._dirty = False
+        if path is not None:
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (FileNotFoundError, json.JSONDecodeError, OSError):
+                data = {}
+            if isinstance(data, dict) and data.get("schema") == _SCHEMA_HASH and isinstance(data.get("verdicts"), dict):
+                self._verdicts = data["verdicts"]
+
+    def errors(self, raw: bytes, doc: Any) -> tuple[str, ...]:
+        digest = hashlib.sha256(raw).hexdigest()
+        self._seen.add(digest)
+        cached = self._verdicts.get(digest)
+        if isinstance(cached, list):
+            return tuple(cached)
+        errors = tuple(_format_error(error) for error in _validator().iter_errors(doc))
+        self._verdicts[digest] = list(errors)
+        self._dirty = True
+        return errors
+
+    def save(self) -> None:
+        """Persist the verdicts, dropping docs that were not seen in this pass."""
+        stale = set(self._verdicts) - self._seen
+        if self._path is None or not (self._dirty or stale):
+            return
+        for digest in stale:
+            del self._verdicts[digest]
+        write_json_atomic(self._path, {"schema": _SCHEMA_HASH, "verdicts": self._verdicts})
+        self._dirty = False
+
+
+# Process-only verdicts for callers that do not pass a persisted cache
+_VERDICTS = SchemaVerdictCache(None)
+
+
+@dataclass
+class RepoEntry:
+    """Everything the automation reads from one repo folder, loaded once per run."""
+
+    name: str
+    path: Path
+    doc: dict[str, Any] | None = None  # parsed doc/project.json, valid or not
+    doc_error: str | None = None  # skip reason when there is no valid project doc
+    schema_errors: tuple[str, ...] = ()
+    belongs_to: dict[str, str] = field(default_factory=dict)
+    issues: list[IssueRecord] = field(default_factory=list)
+    readme_image: Path | None = None
+
+    @property
+    def doc_path(self) -> Path:
+        return self.path / "doc" / "project.json"
+
+    @property
+    def project(self) -> dict[str, Any] | None:
+        """The project doc if it passed schema validation."""
+        return self.doc if self.doc_error is None else None
+
+    def reload_doc(self, verdicts: SchemaVerdictCache | None = None) -> None:
+        """Re-read doc/project.json after it was written (e.g. by scaffolding)."""
+        self.doc, self.doc_error, self.schema_errors = _load_project_doc(self.doc_path, verdicts)
+        self.readme_image = _find_readme_image(self.path) if self.project is not None else None
+
+
+@dataclass
+class ProjectCatalog:
+    repos: list[RepoEntry]
+    verdicts: SchemaVerdictCache = field(default_factory=lambda: _VERDICTS)
+
+    def projects(self) -> list[RepoEntry]:
+        return [entry for entry in self.repos if entry.project is not None]
+
+    def issue_index(self) -> list[IssueRecord]:
+        """All issues across repos, in repo then file order."""
+        return [issue for entry in self.repos for issue in entry.issues]
+
+    def recent_issues(self, limit: int | None = None) -> list[IssueRecord]:
+        issues = sorted(self.issue_index(), key=lambda issue: issue.mtime, reverse=True)
+        return issues if limit is None else issues[:limit]
+
+
+def load_catalog(
+    git_project_folder: Path,
+    issue_cache: IssueTitleCache | None = None,
+    verdict_cache: SchemaVerdictCache | None = None,
+) -> ProjectCatalog:
+    """Read project docs, memberships, issues and README images of every repo folder."""
+    titles = issue_cache or IssueTitleCache(None)
+    verdicts = verdict_cache or _VERDICTS
+    repos: list[RepoEntry] = []
+    for repo_dir in sorted(git_project_folder.iterdir()):
+        if not repo_dir.is_dir():
+            continue
+        entry = RepoEntry(
+            name=repo_dir.name,
+            path=repo_dir,
+            belongs_to=_load_belongs_to(repo_dir),
+            issues=_collect_issues(repo_dir, titles),
+        )
+        entry.reload_doc(verdicts)
+        repos.append(entry)
+    titles.save()
+    verdicts.save()
+    return ProjectCatalog(repos=repos, verdicts=verdicts)
+
+
+def validate_project_doc(raw: bytes, doc: Any, verdicts: SchemaVerdictCache | None = None) -> tuple[str, ...]:
+    """Schema errors for a project doc, cached by the hash of its file content."""
+    return (verdicts or _VERDICTS).errors(raw, doc)
+
+
+def _validator() -> Any:
+    """Compiled validator for project_json_schema.json, built (and schema-checked) once."""
+    global _VALIDATOR
+    if _VALIDATOR is None:
+        validator_cls = jsonschema.validators.validator_for(_SCHEMA)
+        validator_cls.check_schema(_SCHEMA)
+        _VALIDATOR = validator_cls(_SCHEMA)
+    return _VALIDATOR
+
+
+def _format_error(error: jsonschema.ValidationError) -> str:
+    location = "/".join(str(part) for part in error.absolute_path)
+    return f"{location}: {error.message}" if location else error.message
+
+
+def _load_project_doc(
+    doc_path: Path,
+    verdicts: SchemaVerdictCache | None = None,
+) -> tuple[dict[str, Any] | None, str | None, tuple[str, ...]]:
+    if not doc_path.exists():
+        return None, "no doc/project.json", ()
+    try:
+        raw = doc_path.read_bytes()
+        doc = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError, OSError) as e:
+        return None, f"parse error: {e}", ()
+    errors = validate_project_doc(raw, doc, verdicts)
+    if errors:
+        return doc, f"schema invalid: {'; '.join(errors)}", errors
+    return doc, None, ()
+
+
+def _load_belongs_to(repo_dir: Path) -> dict[str, str]:
+    belongs_path = repo_dir / "doc" / "belongs_to.json"
+    if not belongs_path.exists():
+        return {}
+    try:
+        raw = json.loads(belongs_path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    if not isinstance(raw, dict):
+        return {}
+    return {k: str(v) for k, v in raw.items()}
+
+
+def _collect_issues(repo_dir: Path, titles: IssueTitleCache) -> list[IssueRecord]:
+    issues_dir = repo_dir / "doc" / "issues"
+    if not issues_dir.is_dir():
+        return []
+    issues = []
+    for md in sorted(issues_dir.glob("*.md")):
+        try:
+            stat = md.stat()
+            title = titles.title(md, stat)
+        except OSError:
+            continue
+        issues.append(IssueRecord(
+            repo=repo_dir.name,
+            title=title,
+            file=md,
+            mtime=datetime.fromtimestamp(stat.st_mtime),
+        ))
+    return issues
+
+
+def _read_first_heading(md: Path) -> str | None:
+    """Read line by line and stop at the first markdown heading."""
+    with md.open(encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            match = HEADING_RE.match(line.rstrip("\r\n"))
+            if match:
+                return match.group(1).strip()
+    return None
+
+
+def _find_readme_image(repo_dir: Path) -> Path | None:
+    readme = repo_dir / "README.md"
+    if not readme.exists():
+        return None
+    return _find_first_image(readme, repo_dir)
+
+
+def _find_first_image(readme: Path, repo_dir: Path) -> Path | None:
+    content = readme.read_text(encoding="utf-8")
+    for match in IMAGE_RE.finditer(content):
+        url = match.group(1).strip()
+        if url.startswith(("http://", "https://", "ftp://")):
+            continue
+        suffix = Path(url).suffix.lower()
+        if suffix not in IMAGE_EXTS:
+            continue
+        candidate = (repo_dir / url).resolve()
+        if candidate.exists():
+            return candidate
+    return None
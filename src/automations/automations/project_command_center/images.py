@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from io import BytesIO
+import json
+import multiprocessing
+import os
+from pathlib import Path
+from typing import Any
+
+from ...output_writer import OutputWriter, file_sha256, write_json_atomic
+from ...services.asset_sync import sync_file
+
+DEFAULT_MAX_SIZE = 1280
+DEFAULT_QUALITY = 80
+MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ImageJob:
+    project_id: str
+    src: Path
+    dest: Path
+
+
+@dataclass
+class ImageSyncResult:
+    converted: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)  # project_id → error
+
+
+def sync_project_images(
+    jobs: list[ImageJob],
+    manifest_path: Path,
+    max_size: int = DEFAULT_MAX_SIZE,
+    quality: int = DEFAULT_QUALITY,
+    workers: int | None = None,
+    output: OutputWriter | None = None,
+) -> ImageSyncResult:
+    """Export README hero images as WebP, skipping sources that did not change.
+
+    The manifest remembers each source's stat and content hash plus the output settings;
+    a job only runs when the source content, the settings or the output file changed.
+    Conversions run in a process pool; the encoded files are written through ``output``.
+    """
+    output = output or OutputWriter()
+    manifest = _load_manifest(manifest_path)
+    params = f"webp:{max_size}:{quality}"
+    result = ImageSyncResult()
+    next_manifest: dict[str, dict[str, Any]] = {}
+    pending: list[tuple[ImageJob, dict[str, Any]]] = []
+
+    for job in jobs:
+        key = str(job.dest)
+        try:
+            src_stat = job.src.stat()
+        except OSError as e:
+            result.failed[job.project_id] = str(e)
+            continue
+        record = {
+            "src": str(job.src),
+            "src_size": src_stat.st_size,
+            "src_mtime_ns": src_stat.st_mtime_ns,
+            "params": params,
+        }
+        previous = manifest.get(key)
+        if previous is not None and _is_current(previous, job, record):
+            record["src_hash"] = previous["src_hash"]
+            record["dest_size"] = previous["dest_size"]
+            record["dest_mtime_ns"] = previous["dest_mtime_ns"]
+            next_manifest[key] = record
+            result.unchanged.append(job.project_id)
+            continue
+        record["src_hash"] = file_sha256(job.src)
+        if previous is not None and _same_content(previous, job, record):
+            record["dest_size"] = previous["dest_size"]
+            record["dest_mtime_ns"] = previous["dest_mtime_ns"]
+            next_manifest[key] = record
+            result.unchanged.append(job.project_id)
+            continue
+        pending.append((job, record))
+
+    if pending:
+        outcomes = _run_conversions(pending, max_size, quality, workers)
+        for (job, record), outcome in zip(pending, outcomes):
+            try:
+                if isinstance(outcome, Exception):
+                    raise outcome
+                if outcome is None:
+                    # Already a small WebP: reflink or hardlink it instead of copying the bytes
+                    sync_file(job.src, job.dest)
+                else:
+                    output.write_bytes(job.dest, outcome)
+                dest_stat = job.dest.stat()
+            except Exception as e:
+                result.failed[job.project_id] = f"{type(e).__name__}: {e}"
+                continue
+            record["dest_size"], record["dest_mtime_ns"] = dest_stat.st_size, dest_stat.st_mtime_ns
+            next_manifest[str(job.dest)] = record
+            result.converted.append(job.project_id)
+
+    if next_manifest != manifest:
+        _save_manifest(manifest_path, next_manifest)
+    return result
+
+
+def convert_to_webp(src: Path, max_size: int, quality: int) -> bytes | None:
+    """``src`` encoded as WebP no larger than ``max_size`` on either side.
+
+    Returns None when ``src`` already is such a WebP and can be used as is.
+    """
+    from PIL import Image
+
+    with Image.open(src) as img:
+        if src.suffix.lower() == ".webp" and max(img.size) <= max_size:
+            return None
+        # JPEG can decode straight at a reduced scale, skipping most of the pixels
+        img.draft("RGB", (max_size, max_size))
+        img.thumbnail((max_size, max_size))
+        if img.mode not in ("RGB", "RGBA"):
+            has_alpha = img.mode in ("LA", "PA") or "transparency" in img.info
+            img = img.convert("RGBA" if has_alpha else "RGB")
+        buffer = BytesIO()
+        img.save(buffer, "WEBP", quality=quality, method=4)
+    return buffer.getvalue()
+
+
+def _run_conversions(
+    pending: list[tuple[ImageJob, dict[str, Any]]],
+    max_size: int,
+    quality: int,
+    workers: int | None,
+) -> list[bytes | None | Exception]:
+    if len(pending) == 1 or workers == 1:
+        return [_safe_convert(job.src, max_size, quality) for job, _ in pending]
+    max_workers = min(len(pending), workers or os.cpu_count() or 1)
+    # forkserver like the other pools: a fork of a threaded process can copy a held lock
+    context = multiprocessing.get_context("forkserver")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+        futures = [
+            pool.submit(_safe_convert, job.src, max_size, quality)
+            for job, _ in pending
+        ]
+        return [future.result() for future in futures]
+
+
+def _safe_convert(src: Path, max_size: int, quality: int) -> bytes | None | Exception:
+    try:
+        return convert_to_webp(src, max_size, quality)
+    except Exception as e:
+        return e
+
+
+def _is_current(previous: dict[str, Any], job: ImageJob, record: dict[str, Any]) -> bool:
+    return (
+        previous.get("src_size") == record["src_size"]
+        and previous.get("src_mtime_ns") == record["src_mtime_ns"]
+        and _same_output(previous, job, record)
+    )
+
+
+def _same_content(previous: dict[str, Any], job: ImageJob, record: dict[str, Any]) -> bool:
+    return previous.get("src_hash") == record["src_hash"] and _same_output(previous, job, record)
+
+
+def _same_output(previous: dict[str, Any], job: ImageJob, record: dict[str, Any]) -> bool:
+    if previous.get("src") != record["src"] or previous.get("params") != record["params"]:
+        return False
+    try:
+        dest_stat = job.dest.stat()
+    except OSError:
+        return False
+    return (
+        previous.get("dest_size") == dest_stat.st_size
+        and previous.get("dest_mtime_ns") == dest_stat.st_mtime_ns
+    )
+
+
+def _load_manifest(path: Path) -> dict[str, dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    images = data.get("images")
+    return images if isinstance(images, dict) else {}
+
+
+def _save_manifest(path: Path, images: dict[str, dict[str, Any]]) -> None:
+    write_json_atomic(path, {"version": MANIFEST_VERSION, "images": images}, indent=2)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from datetime import datetime
+import hashlib
+import json
 from pathlib import Path
 import subprocess
 from typing import Any
@@ -8,9 +10,12 @@ from typing import Any
 from ..base import Automation
 from ...context import AutomationContext
 from ...models import AutomationResult, AutomationSpec
+from ...output_writer import file_sha256, write_json_atomic
+from ...services.obsidian import index_media, scan_notes
 
 PORTFOLIO_PATH = Path("/home/brokkoli/GITHUB/zk-best-learning-tool")
 OBSIDIAN_COMMAND = [".venv/bin/obsidian-to-web", "--config", "config.yaml"]
+STATE_VERSION = 1
 
 
 class PublishPortfolioFromObsAutomation(Automation):
@@ -18,16 +23,32 @@ class PublishPortfolioFromObsAutomation(Automation):
         id="publish_portfolio_from_obs",
         title="Publish Portfolio from Obsidian",
         description="Build and publish the Obsidian portfolio site.",
+        feeds_dashboard=False,
     )
 
     def run(self, ctx: AutomationContext) -> dict[str, Any]:
-        # Check if already deployed today (unless force flag is set)
+        settings = ctx.config.settings
+        vault_path = Path(str(settings["vault_path"])).expanduser()
+        include = str(settings.get("portfolio_include_string") or settings.get("essay_include_string") or "")
+        if not include:
+            raise ValueError("publish_portfolio_from_obs requires 'portfolio_include_string' in config.yaml")
+        vault_media = Path(str(settings.get("vault_media_path") or vault_path)).expanduser()
+
+        state_path = ctx.config.cache_root / self.spec.id / "state.json"
+        state = _load_state(state_path)
+        known_notes = state.get("notes", {}) if state.get("include") == include else {}
+        notes = scan_notes(vault_path, include, known_notes)
+        published = {path: info for path, info in notes.items() if info["selected"]}
+        media = _hash_media(published, index_media(vault_media), state.get("media", {}))
+        fingerprint = _publish_fingerprint(published, media)
+        # Keep the scan cache even if the build below fails
+        state.update(version=STATE_VERSION, include=include, notes=notes, media=media)
+        _save_state(state_path, state)
+
+        # Skip the build entirely when no publishable note or media changed (unless forced)
         force = "zk_deploy" in ctx.force_flags
-        if not force:
-            cached = _load_cached_result(ctx, self.spec.id)
-            if cached is not None:
-                cached["cached"] = True
-                return cached
+        if not force and state.get("published") == fingerprint:
+            return {"status": "unchanged", "notes": len(published), "media": len(media)}
 
         _ensure_portfolio_path()
         _ensure_obsidian_cli()
@@ -41,11 +62,21 @@ class PublishPortfolioFromObsAutomation(Automation):
             ["git", "commit", "-m", f"auto-commit {timestamp}"],
             cwd=PORTFOLIO_PATH,
         )
-        if not committed:
-            return {"status": "no_changes", "cached": False}
-        _run_command(["git", "push"], cwd=PORTFOLIO_PATH)
+        if committed:
+            # Pushed by the outbox worker after the dashboard; repeated pushes collapse into one
+            ctx.outbox.enqueue("git_push", {"cwd": str(PORTFOLIO_PATH)}, key=f"git_push:{PORTFOLIO_PATH}")
+        state["published"] = fingerprint
+        _save_state(state_path, state)
 
-        return {"status": "updated", "timestamp": timestamp, "cached": False}
+        if not committed:
+            return {"status": "no_changes", "notes": len(published), "media": len(media)}
+        return {
+            "status": "updated",
+            "timestamp": timestamp,
+            "push": "queued",
+            "notes": len(published),
+            "media": len(media),
+        }
 
 
 def _ensure_portfolio_path() -> None:
@@ -96,17 +127,47 @@ def _is_nothing_to_commit(output: str) -> bool:
     return "nothing to commit" in lowered or "no changes added to commit" in lowered
 
 
-def _load_cached_result(ctx: AutomationContext, automation_id: str) -> dict[str, Any] | None:
-    """Return cached result if this automation already ran successfully today."""
-    latest = ctx.log.latest_event(automation_id, "result")
-    if not latest:
-        return None
-    if latest.get("status") != "ok":
-        return None
-    payload = latest.get("payload")
-    if not isinstance(payload, dict):
-        return None
-    status = payload.get("status")
-    if status in ("updated", "no_changes"):
-        return {"status": status, "timestamp": payload.get("timestamp")}
-    return None
+def _hash_media(
+    notes: dict[str, dict[str, Any]],
+    media_index: dict[str, Path],
+    known: dict[str, Any],
+) -> dict[str, dict[str, Any]]:
+    """Stat and hash of every media file the notes embed; unchanged files keep their hash."""
+    media: dict[str, dict[str, Any]] = {}
+    for info in notes.values():
+        for target in info["embeds"]:
+            source = media_index.get(Path(target).name.lower())
+            if source is None or str(source) in media:
+                continue
+            stat = source.stat()
+            previous = known.get(str(source))
+            if previous and previous.get("mtime_ns") == stat.st_mtime_ns and previous.get("size") == stat.st_size:
+                media[str(source)] = previous
+                continue
+            media[str(source)] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": file_sha256(source)}
+    return media
+
+
+def _publish_fingerprint(notes: dict[str, dict[str, Any]], media: dict[str, dict[str, Any]]) -> str:
+    payload = json.dumps(
+        {
+            "notes": sorted([path, info["mtime_ns"], info["sha256"]] for path, info in notes.items()),
+            "media": sorted([path, info["mtime_ns"], info["sha256"]] for path, info in media.items()),
+        },
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _load_state(path: Path) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+        return {}
+    return data
+
+
+def _save_state(path: Path, data: dict[str, Any]) -> None:
+    write_json_atomic(path, data)
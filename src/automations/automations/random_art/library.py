@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from PIL import Image
+
+from ...output_writer import atomic_path, file_sha256, write_json_atomic
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".svg"}
+MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ArtEntry:
+    name: str
+    size: int
+    mtime_ns: int
+    width: int | None  # None for SVG and unreadable files
+    height: int | None
+    format: str | None
+    sha256: str | None = None  # filled in the first time the image is chosen
+
+
+class ArtLibrary:
+    """Manifest of the art folder, persisted between runs.
+
+    The folder is only listed again when its mtime changes (a file was added, removed or
+    renamed); otherwise the entries come straight from the manifest. Chosen images get a
+    downscaled derivative, cached by source hash and target size.
+    """
+
+    def __init__(self, folder: Path, cache_dir: Path) -> None:
+        self.folder = folder
+        self.cache_dir = cache_dir
+        self.manifest_path = cache_dir / "library.json"
+        self.derivative_dir = cache_dir / "derivatives"
+        self._entries: dict[str, ArtEntry] = {}
+        self._folder_mtime_ns: int | None = None
+        self._dirty = False
+        self.rescanned = False
+
+    def entries(self) -> list[ArtEntry]:
+        folder_mtime_ns = self.folder.stat().st_mtime_ns
+        manifest = _load_manifest(self.manifest_path)
+        known = _manifest_entries(manifest)
+        if manifest.get("folder") == str(self.folder) and manifest.get("folder_mtime_ns") == folder_mtime_ns:
+            self._entries = known
+        else:
+            self._entries = self._scan(known)
+            self._prune_derivatives()
+            self._dirty = True
+            self.rescanned = True
+        self._folder_mtime_ns = folder_mtime_ns
+        return sorted(self._entries.values(), key=lambda entry: entry.name)
+
+    def derivative(self, entry: ArtEntry, box: tuple[int, int]) -> Path:
+        """Path of ``entry`` scaled to fit ``box``, or the source when no scaling is needed."""
+        source = self.folder / entry.name
+        stat = source.stat()
+        if (stat.st_size, stat.st_mtime_ns) != (entry.size, entry.mtime_ns):
+            entry = _probe(source, stat)
+            self._entries[entry.name] = entry
+            self._dirty = True
+        if entry.width is None or entry.height is None or entry.format == "SVG":
+            return source
+        if entry.width <= box[0] and entry.height <= box[1]:
+            return source
+
+        if entry.sha256 is None:
+            entry = ArtEntry(**{**asdict(entry), "sha256": file_sha256(source)})
+            self._entries[entry.name] = entry
+            self._dirty = True
+        suffix = ".png" if entry.format in ("PNG", "GIF", "WEBP") else ".jpg"
+        path = self.derivative_dir / f"{entry.sha256[:32]}-{box[0]}x{box[1]}{suffix}"
+        if not path.exists():
+            _write_derivative(source, path, box)
+        return path
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        data = {
+            "version": MANIFEST_VERSION,
+            "folder": str(self.folder),
+            "folder_mtime_ns": self._folder_mtime_ns,
+            "entries": {name: asdict(entry) for name, entry in sorted(self._entries.items())},
+        }
+        write_json_atomic(self.manifest_path, data)
+        self._dirty = False
+
+    def _scan(self, known: dict[str, ArtEntry]) -> dict[str, ArtEntry]:
+        entries: dict[str, ArtEntry] = {}
+        with os.scandir(self.folder) as it:
+            for item in it:
+                if not item.is_file() or Path(item.name).suffix.lower() not in IMAGE_EXTENSIONS:
+                    continue
+                stat = item.stat()
+                previous = known.get(item.name)
+                if previous is not None and (previous.size, previous.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                    entries[item.name] = previous
+                else:
+                    entries[item.name] = _probe(Path(item.path), stat)
+        return entries
+
+    def _prune_derivatives(self) -> None:
+        hashes = {entry.sha256[:32] for entry in self._entries.values() if entry.sha256}
+        if not self.derivative_dir.is_dir():
+            return
+        for path in self.derivative_dir.iterdir():
+            if path.name.split("-", 1)[0] not in hashes:
+                path.unlink(missing_ok=True)
+
+
+def _manifest_entries(manifest: dict[str, Any]) -> dict[str, ArtEntry]:
+    entries: dict[str, ArtEntry] = {}
+    for name, raw in manifest.get("entries", {}).items():
+        try:
+            entries[name] = ArtEntry(**raw)
+        except TypeError:
+            continue
+    return entries
+
+
+def _probe(path: Path, stat: os.stat_result) -> ArtEntry:
+    """Read dimensions and format from the image header without decoding pixels."""
+    width = height = None
+    image_format = "SVG" if path.suffix.lower() == ".svg" else None
+    if image_format is None:
+        try:
+            with Image.open(path) as image:
+                width, height = image.size
+                image_format = image.format
+        except (OSError, Image.DecompressionBombError):
+            pass
+    return ArtEntry(
+        name=path.name,
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        width=width,
+        height=height,
+        format=image_format,
+    )
+
+
+def _write_derivative(source: Path, path: Path, box: tuple[int, int]) -> None:
+    with Image.open(source) as image, atomic_path(path) as tmp_path:
+        # JPEG decodes straight at a reduced scale, so a huge scan never lands in memory at full size
+        image.draft("RGB", box)
+        image.thumbnail(box, Image.Resampling.LANCZOS)
+        if path.suffix == ".jpg":
+            image.convert("RGB").save(tmp_path, "JPEG", quality=90)
+        else:
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+            image.save(tmp_path, "PNG", compress_level=1)
+
+
+def _load_manifest(path: Path) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data
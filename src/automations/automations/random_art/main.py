@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 import random
 from pathlib import Path
 from typing import Any
@@ -7,9 +8,7 @@ from typing import Any
 from ..base import Automation
 from ...context import AutomationContext
 from ...models import AutomationResult, AutomationSpec
-
-
-IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".svg"}
+from .library import ArtLibrary
 
 
 class RandomArtAutomation(Automation):
@@ -34,25 +33,35 @@ class RandomArtAutomation(Automation):
         if not art_folder.is_dir():
             raise ValueError(f"Art folder path is not a directory: {art_folder}")
 
-        image_files = self._find_image_files(art_folder)
+        library = ArtLibrary(art_folder, ctx.config.cache_root / "art")
+        entries = library.entries()
 
-        if not image_files:
+        if not entries:
             raise ValueError(f"No image files found in art folder: {art_folder}")
 
-        selected_image = random.choice(image_files)
+        selected = random.choice(entries)
+        image_path = library.derivative(selected, _artwork_box(ctx))
+        library.save()
 
         return {
-            "image_path": str(selected_image),
-            "image_name": selected_image.name,
-            "total_images": len(image_files),
+            "image_path": str(image_path),
+            "image_name": selected.name,
+            "source_path": str(art_folder / selected.name),
+            "width": selected.width,
+            "height": selected.height,
+            "total_images": len(entries),
+            "rescanned": library.rescanned,
         }
 
-    def _find_image_files(self, folder: Path) -> list[Path]:
-        """Find all image files in the given folder (non-recursive)."""
-        image_files = []
 
-        for item in folder.iterdir():
-            if item.is_file() and item.suffix.lower() in IMAGE_EXTENSIONS:
-                image_files.append(item)
-
-        return image_files
+def _artwork_box(ctx: AutomationContext) -> tuple[int, int]:
+    """Pixel box of the dashboard artwork (a third of the screen) at the largest output scale."""
+    report = ctx.config.report
+    scale = max(
+        [1.0]
+        + [
+            max(target.pixel_size[0] / report.screen_width, target.pixel_size[1] / report.screen_height)
+            for target in report.outputs
+        ]
+    )
+    return math.ceil(report.screen_width * scale / 3), math.ceil(report.screen_height * scale / 3)
@@ -1,13 +1,27 @@
 from __future__ import annotations
 
+import hashlib
+from io import BytesIO
+import json
 from pathlib import Path
 import shutil
 import subprocess
 from typing import Any
 
+from PIL import Image, ImageOps
+
 from ..base import Automation
+from ...config import IMAGE_FORMATS, OutputTarget
 from ...context import AutomationContext
+from ...dto import DashboardDTO
 from ...models import AutomationResult, AutomationSpec
+from ...output_writer import OutputWriter
+from ...report.html import TEMPLATE_DIR
+from ...report.raster import LAYOUT_VERSION, render_dashboard_image
+from ...services.browser import HeadlessBrowser
+
+DEFAULT_FINGERPRINT_EXCLUDE = ("generated_at",)
+BROWSER_RENDERERS = ("wkhtmltoimage", "chromium", "chromium-browser", "google-chrome", "google-chrome-stable")
 
 
 class WallpaperFromReportAutomation(Automation):
@@ -20,22 +34,56 @@ class WallpaperFromReportAutomation(Automation):
 
     def run(self, ctx: AutomationContext) -> dict[str, Any]:
         html_path = _resolve_html_path(ctx)
-        output_path = _resolve_output_path(ctx)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        targets = _resolve_targets(ctx)
+        wallpaper_path = targets[0].path
+        renderer = str(ctx.config.settings.get("wallpaper_renderer", "auto"))
 
-        _render_html_to_image(
+        fingerprint = _wallpaper_fingerprint(ctx, targets, renderer)
+        if fingerprint is not None:
+            applied = ctx.log.latest_event(self.spec.id, "wallpaper_applied")
+            if (
+                applied
+                and applied.get("fingerprint") == fingerprint
+                and all(target.path.exists() for target in targets)
+            ):
+                return {
+                    "status": "skipped_unchanged",
+                    "html_path": str(html_path),
+                    "image_path": str(wallpaper_path),
+                    "image_paths": [str(target.path) for target in targets],
+                    "fingerprint": fingerprint,
+                }
+
+        browser = ctx.services.browser() if renderer == "devtools" else None
+        used_renderer = _render_outputs(
             html_path=html_path,
-            output_path=output_path,
+            targets=targets,
             screen_width=ctx.config.report.screen_width,
             screen_height=ctx.config.report.screen_height,
-            renderer="auto",
+            renderer=renderer,
+            master_path=ctx.config.cache_root / "wallpaper" / "master.png",
+            dto=ctx.dashboard,
+            output=ctx.output,
+            browser=browser,
         )
+        if browser is not None and not ctx.services.service_config("browser").get("keep_alive", True):
+            browser.close()
 
-        _set_wallpaper(output_path, picture_options="zoom")
+        _set_wallpaper(wallpaper_path, picture_options="zoom")
+        if fingerprint is not None:
+            ctx.log.append(self.spec.id, "wallpaper_applied", {
+                "fingerprint": fingerprint,
+                "image_path": str(wallpaper_path),
+            })
 
         return {
+            "status": "applied",
             "html_path": str(html_path),
-            "image_path": str(output_path),
+            "image_path": str(wallpaper_path),
+            "image_paths": [str(target.path) for target in targets],
+            "renderer": used_renderer,
+            "browser_restarts": browser.restart_count if browser is not None else None,
+            "fingerprint": fingerprint,
         }
 
 
@@ -56,43 +104,173 @@ def _resolve_output_path(ctx: AutomationContext) -> Path:
     return path
 
 
-def _render_html_to_image(
+def _resolve_targets(ctx: AutomationContext) -> tuple[OutputTarget, ...]:
+    """Configured report outputs, or the screen-sized ``wallpaper_output_image``. The first is the wallpaper."""
+    if ctx.config.report.outputs:
+        return ctx.config.report.outputs
+    return (
+        OutputTarget(
+            width=ctx.config.report.screen_width,
+            height=ctx.config.report.screen_height,
+            path=_resolve_output_path(ctx),
+        ),
+    )
+
+
+def _wallpaper_fingerprint(
+    ctx: AutomationContext,
+    targets: tuple[OutputTarget, ...],
+    renderer: str,
+) -> str | None:
+    """Fingerprint of everything that ends up in the wallpaper, or None without a DTO.
+
+    Combines the DTO fingerprint with the render settings, the layout (report templates
+    and the raster layout version) and the stat of the images the dashboard embeds, so an
+    edited template or a replaced image file at the same path still triggers a render.
+    """
+    dto = ctx.dashboard
+    if dto is None:
+        return None
+    exclude = ctx.config.settings.get("wallpaper_fingerprint_exclude", DEFAULT_FINGERPRINT_EXCLUDE)
+    parts = {
+        "dto": dto.fingerprint(exclude=tuple(str(key) for key in exclude or ())),
+        "screen": [ctx.config.report.screen_width, ctx.config.report.screen_height],
+        "targets": [
+            [str(target.path), target.width, target.height, target.scale, target.format]
+            for target in targets
+        ],
+        "renderer": renderer,
+        "layout": _layout_key(),
+        "images": [_stat_key(path) for path in (dto.artwork_image_path, dto.random_project_image_path)],
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _layout_key() -> dict[str, Any]:
+    templates = [TEMPLATE_DIR / "template.html", *sorted((TEMPLATE_DIR / "widgets").glob("*.html"))]
+    return {
+        "raster": LAYOUT_VERSION,
+        "templates": {path.relative_to(TEMPLATE_DIR).as_posix(): _stat_key(str(path)) for path in templates},
+    }
+
+
+def _stat_key(path: str) -> list[Any] | None:
+    if not path:
+        return None
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _render_outputs(
     html_path: Path,
-    output_path: Path,
+    targets: tuple[OutputTarget, ...],
     screen_width: int,
     screen_height: int,
     renderer: str,
-) -> None:
-    html_uri = html_path.resolve().as_uri()
+    master_path: Path,
+    dto: DashboardDTO | None = None,
+    output: OutputWriter | None = None,
+    browser: HeadlessBrowser | None = None,
+) -> str:
+    """Render the dashboard once and derive every output target from that image.
 
+    The master is rendered at the largest device scale any target needs; each target is
+    then a resize (cropped to its aspect ratio, like the "zoom" picture option) and an encode.
+    ``"pillow"`` draws the master straight from the DTO, ``"devtools"`` screenshots it
+    through the long-lived ``browser``, and a binary name runs that renderer once;
+    ``"auto"`` prefers an installed browser and falls back to pillow.
+    Returns the renderer that was used.
+    """
+    output = output or OutputWriter()
+    scale = max(
+        max(target.pixel_size[0] / screen_width, target.pixel_size[1] / screen_height)
+        for target in targets
+    )
+    used_renderer = _pick_renderer(renderer, dto)
+    if used_renderer == "pillow":
+        assert dto is not None
+        master = render_dashboard_image(dto, round(screen_width * scale), round(screen_height * scale))
+    elif used_renderer == "devtools":
+        png = _devtools_screenshot(browser, html_path, screen_width, screen_height, scale)
+        with Image.open(BytesIO(png)) as image:
+            master = image.convert("RGB")
+    else:
+        master_path.parent.mkdir(parents=True, exist_ok=True)
+        _run_renderer(used_renderer, html_path.resolve().as_uri(), master_path, screen_width, screen_height, scale)
+        with Image.open(master_path) as image:
+            master = image.convert("RGB")
+
+    for target in targets:
+        _write_target(master, target, output)
+    return used_renderer
+
+
+def _write_target(master: Image.Image, target: OutputTarget, output: OutputWriter) -> None:
+    size = target.pixel_size
+    image = master if master.size == size else ImageOps.fit(master, size, Image.Resampling.LANCZOS)
+    buffer = BytesIO()
+    image_format = IMAGE_FORMATS[target.format]
+    if image_format == "PNG":
+        # Fast zlib level: the wallpaper never leaves the machine, encode time matters more than size
+        image.save(buffer, image_format, compress_level=1)
+    else:
+        image.save(buffer, image_format, quality=90)
+    output.write_bytes(target.path, buffer.getvalue())
+
+
+def _pick_renderer(renderer: str, dto: DashboardDTO | None) -> str:
+    """Resolve ``"auto"`` to an installed browser, falling back to pillow when the DTO is available."""
+    if renderer == "pillow":
+        if dto is None:
+            raise ValueError("The pillow renderer needs the dashboard DTO")
+        return renderer
     if renderer != "auto":
-        _run_renderer(renderer, html_uri, output_path, screen_width, screen_height)
-        return
+        return renderer
 
-    for candidate in ("wkhtmltoimage", "chromium", "chromium-browser", "google-chrome", "google-chrome-stable"):
+    for candidate in BROWSER_RENDERERS:
         if shutil.which(candidate):
-            _run_renderer(candidate, html_uri, output_path, screen_width, screen_height)
-            return
+            return candidate
+
+    if dto is not None:
+        return "pillow"
 
     raise RuntimeError(
         "No HTML renderer available. Install wkhtmltoimage or chromium/google-chrome for headless rendering."
     )
 
 
+def _devtools_screenshot(
+    browser: HeadlessBrowser | None,
+    html_path: Path,
+    screen_width: int,
+    screen_height: int,
+    scale: float,
+) -> bytes:
+    if browser is None:
+        raise ValueError("The devtools renderer needs the shared headless browser")
+    return browser.screenshot(html_path.resolve().as_uri(), screen_width, screen_height, scale)
+
+
 def _run_renderer(
     renderer: str,
     html_uri: str,
     output_path: Path,
     screen_width: int,
     screen_height: int,
+    scale: float = 1.0,
 ) -> None:
     if renderer == "wkhtmltoimage":
         cmd = [
             renderer,
+            "--zoom",
+            f"{scale:g}",
             "--width",
-            str(screen_width),
+            str(round(screen_width * scale)),
             "--height",
-            str(screen_height),
+            str(round(screen_height * scale)),
             html_uri,
             str(output_path),
         ]
@@ -102,7 +280,7 @@ def _run_renderer(
             "--headless",
             "--disable-gpu",
             "--hide-scrollbars",
-            "--force-device-scale-factor=1",
+            f"--force-device-scale-factor={scale:g}",
             f"--window-size={screen_width},{screen_height}",
             f"--screenshot={output_path}",
             html_uri,
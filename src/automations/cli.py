@@ -3,7 +3,7 @@ from __future__ import annotations
 import argparse
 
 from .config import load_config
-from .runner import run_automations
+from .runner import render_from_snapshot, run_automations
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -16,13 +16,26 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--force-zk-deploy",
         action="store_true",
-        help="Force zk portfolio deployment even if already run today",
+        help="Force zk portfolio deployment even if no publishable note changed",
     )
     parser.add_argument(
         "--force-github",
         action="store_true",
         help="Force GitHub API fetch in project_command_center even if already run today",
     )
+    subparsers = parser.add_subparsers(dest="command")
+    render = subparsers.add_parser(
+        "render",
+        help="Rebuild the dashboard from a stored run without running any automation",
+    )
+    render.add_argument(
+        "--from-snapshot",
+        nargs="?",
+        const="latest",
+        default="latest",
+        metavar="RUN_ID",
+        help="Run id under runtime/snapshots/ to render (default: the latest run)",
+    )
     return parser
 
 
@@ -30,6 +43,17 @@ def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
 
+    if args.command == "render":
+        config = load_config(filename=args.config)
+        run_id = None if args.from_snapshot == "latest" else args.from_snapshot
+        try:
+            report_path = render_from_snapshot(config, run_id)
+        except FileNotFoundError as exc:
+            print(exc)
+            return 1
+        print(f"HTML report written: {report_path}")
+        return 0
+
     force_flags: set[str] = set()
     if args.force_zk_deploy:
         force_flags.add("zk_deploy")
@@ -55,6 +79,12 @@ def _print_summary(summary) -> None:
     else:
         print("HTML report not generated (see run log)")
 
+    print(f"Files written: {summary.files_written}, unchanged: {summary.files_unchanged}")
+    print(
+        f"Outbox: {summary.outbox_queued} queued, {summary.outbox_delivered} delivered, "
+        f"{summary.outbox_pending} pending"
+    )
+
     if summary.warnings:
         print("Warnings:")
         for warning in summary.warnings:
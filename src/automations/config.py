@@ -9,12 +9,29 @@ import yaml
 
 DEFAULT_SCREEN_WIDTH = 2560
 DEFAULT_SCREEN_HEIGHT = 1600
+IMAGE_FORMATS = {"png": "PNG", "jpg": "JPEG", "jpeg": "JPEG", "webp": "WEBP"}
+
+
+@dataclass(frozen=True)
+class OutputTarget:
+    """One rendered wallpaper: logical size, device scale factor, image format and path."""
+
+    width: int
+    height: int
+    path: Path
+    scale: float = 1.0
+    format: str = "png"
+
+    @property
+    def pixel_size(self) -> tuple[int, int]:
+        return round(self.width * self.scale), round(self.height * self.scale)
 
 
 @dataclass(frozen=True)
 class ReportConfig:
     screen_width: int
     screen_height: int
+    outputs: tuple[OutputTarget, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -24,6 +41,10 @@ class AppConfig:
     services: dict[str, Any]
     settings: dict[str, Any]
 
+    @property
+    def cache_root(self) -> Path:
+        return self.project_root / "runtime" / "cache"
+
 
 def project_root() -> Path:
     env_root = os.getenv("AUTOMATIONS_ROOT")
@@ -50,6 +71,7 @@ def load_config(root: Path | None = None, filename: str = "config.yaml") -> AppC
 
     screen_width = int(report_raw.get("screen_width", DEFAULT_SCREEN_WIDTH))
     screen_height = int(report_raw.get("screen_height", DEFAULT_SCREEN_HEIGHT))
+    outputs = _parse_outputs(base, report_raw.get("outputs"), screen_width, screen_height)
 
     services_raw = raw.get("services", {})
     if services_raw is None:
@@ -63,6 +85,7 @@ def load_config(root: Path | None = None, filename: str = "config.yaml") -> AppC
     report = ReportConfig(
         screen_width=screen_width,
         screen_height=screen_height,
+        outputs=outputs,
     )
 
     return AppConfig(
@@ -73,6 +96,39 @@ def load_config(root: Path | None = None, filename: str = "config.yaml") -> AppC
     )
 
 
+def _parse_outputs(
+    base: Path,
+    raw_outputs: Any,
+    screen_width: int,
+    screen_height: int,
+) -> tuple[OutputTarget, ...]:
+    if raw_outputs is None:
+        return ()
+    if not isinstance(raw_outputs, list):
+        raise ValueError("report.outputs must be a list")
+    outputs = []
+    for index, raw in enumerate(raw_outputs):
+        if not isinstance(raw, dict):
+            raise ValueError(f"report.outputs[{index}] must be a mapping")
+        if not raw.get("path"):
+            raise ValueError(f"report.outputs[{index}] needs a path")
+        path = _resolve_path(base, raw["path"])
+        image_format = str(raw.get("format") or path.suffix.lstrip(".") or "png").lower()
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"report.outputs[{index}]: unsupported format '{image_format}'")
+        scale = float(raw.get("scale", 1.0))
+        if scale <= 0:
+            raise ValueError(f"report.outputs[{index}]: scale must be positive")
+        outputs.append(OutputTarget(
+            width=int(raw.get("width", screen_width)),
+            height=int(raw.get("height", screen_height)),
+            path=path,
+            scale=scale,
+            format=image_format,
+        ))
+    return tuple(outputs)
+
+
 def _resolve_path(base: Path, raw_value: Any) -> Path:
     if isinstance(raw_value, Path):
         return raw_value
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from pathlib import Path
 
 from .config import AppConfig
+from .dto import DashboardDTO
 from .logging.log_writer import LogWriter
+from .outbox import Outbox
+from .output_writer import OutputWriter
 from .services.registry import ServiceRegistry
 
 
@@ -16,5 +19,9 @@ class AutomationContext:
     log: LogWriter
     run_date: date
     run_id: str
+    # Side effects (pushes, messages) delivered in the background after the dashboard
+    outbox: Outbox
     report_path: Path | None = None
+    dashboard: DashboardDTO | None = None
     force_flags: frozenset[str] = frozenset()
+    output: OutputWriter = field(default_factory=OutputWriter)
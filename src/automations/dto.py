@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+import hashlib
+import json
+from typing import Any, Iterable
 
 
 @dataclass
@@ -59,6 +61,13 @@ class DashboardDTO:
             "random_project_image_path": self.random_project_image_path,
         }
 
+    def fingerprint(self, exclude: Iterable[str] = ("generated_at",)) -> str:
+        """sha256 of the rendered fields, ignoring volatile ones such as the timestamp."""
+        skipped = set(exclude)
+        data = {key: value for key, value in self.to_dict().items() if key not in skipped}
+        encoded = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
     def _get_color(self, commit_count: int, max_commits: int) -> str:
         """Map commit count to GitHub-style green gradient."""
         if commit_count == 0:
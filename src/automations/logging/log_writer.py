@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from datetime import date, datetime
 import json
 from pathlib import Path
+import threading
 from typing import Any
 
 
@@ -20,6 +21,8 @@ class LogWriter:
         self._root = root
         self._run_date = run_date
         self._run_id = run_id
+        # Background automations log from worker threads
+        self._lock = threading.Lock()
 
     def append(self, automation_id: str, event: str, payload: dict[str, Any]) -> None:
         entry = LogEntry(
@@ -70,7 +73,8 @@ class LogWriter:
         return date_dir / "run.jsonl"
 
     def _write_entry(self, path: Path, entry: LogEntry) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(entry.__dict__, sort_keys=True, default=str))
-            handle.write("\n")
+        line = json.dumps(entry.__dict__, sort_keys=True, default=str) + "\n"
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
@@ -11,6 +11,9 @@ class AutomationSpec:
     title: str
     description: str
     stage: str = "primary"
+    # Primaries that return nothing _build_dto reads set this to False; they run in the
+    # background while the dashboard is rendered and the post_report stage runs
+    feeds_dashboard: bool = True
 
 
 AutomationStatus = Literal["ok", "skipped", "error"]
@@ -37,3 +40,8 @@ class RunSummary:
     results: tuple[AutomationResult, ...]
     report_path: str | None
     warnings: tuple[str, ...]
+    files_written: int = 0
+    files_unchanged: int = 0
+    outbox_queued: int = 0
+    outbox_delivered: int = 0
+    outbox_pending: int = 0
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import subprocess
+import threading
+import time
+from typing import Any, Callable
+import uuid
+
+import requests
+
+from .config import AppConfig
+from .logging.log_writer import LogWriter
+from .output_writer import atomic_path
+
+DEFAULT_TELEGRAM_API_BASE = "https://api.telegram.org"
+# Attempts per run, with exponential backoff in between; undelivered items wait for the next run
+RUN_ATTEMPTS = 3
+RETRY_DELAY_S = 1.0
+# Items still failing after this many attempts (across runs) are given up on
+MAX_ATTEMPTS = 20
+
+Handler = Callable[[dict[str, Any]], None]
+
+
+@dataclass(frozen=True)
+class OutboxItem:
+    id: str
+    kind: str
+    payload: dict[str, Any]
+    key: str | None  # at most one pending item per key
+    status: str  # "pending" | "delivered" | "abandoned"
+    attempts: int
+    queued_at: str
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class OutboxStats:
+    queued: int
+    delivered: int
+    pending: int
+
+
+class Outbox:
+    """Durable queue of side effects (pushes, messages) delivered after the dashboard.
+
+    Every state change is appended to ``outbox.jsonl`` and the last line per item wins,
+    so items queued by a run that crashed or went offline are delivered by the next one.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.path = root / "outbox.jsonl"
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._items = _load_items(self.path)
+        self._queued = 0
+        self._delivered = 0
+
+    @property
+    def stats(self) -> OutboxStats:
+        with self._lock:
+            return OutboxStats(queued=self._queued, delivered=self._delivered, pending=len(self._pending()))
+
+    def enqueue(self, kind: str, payload: dict[str, Any], key: str | None = None) -> str:
+        """Queue a side effect; returns the id of the new item, or of the pending item with ``key``."""
+        with self._lock:
+            if key is not None:
+                for item in self._pending():
+                    if item.key == key:
+                        return item.id
+            item = OutboxItem(
+                id=uuid.uuid4().hex,
+                kind=kind,
+                payload=payload,
+                key=key,
+                status="pending",
+                attempts=0,
+                queued_at=datetime.now().isoformat(timespec="seconds"),
+            )
+            self._record(item)
+            self._queued += 1
+        self.notify()
+        return item.id
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Block until an item is queued, ``notify`` is called or ``timeout`` passes."""
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    def pending(self) -> list[OutboxItem]:
+        with self._lock:
+            return self._pending()
+
+    def mark_delivered(self, item: OutboxItem) -> None:
+        with self._lock:
+            self._record(replace(item, status="delivered", attempts=item.attempts + 1, error=None))
+            self._delivered += 1
+
+    def mark_failed(self, item: OutboxItem, error: str) -> OutboxItem:
+        attempts = item.attempts + 1
+        status = "abandoned" if attempts >= MAX_ATTEMPTS else "pending"
+        failed = replace(item, status=status, attempts=attempts, error=error)
+        with self._lock:
+            self._record(failed)
+        return failed
+
+    def compact(self) -> None:
+        """Rewrite the file with only the items that are still pending."""
+        with self._lock:
+            self._items = {item.id: item for item in self._pending()}
+            with atomic_path(self.path) as tmp_path, tmp_path.open("w", encoding="utf-8") as handle:
+                for item in self._items.values():
+                    handle.write(json.dumps(asdict(item), ensure_ascii=False) + "\n")
+
+    def _pending(self) -> list[OutboxItem]:
+        return [item for item in self._items.values() if item.status == "pending"]
+
+    def _record(self, item: OutboxItem) -> None:
+        self._items[item.id] = item
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(asdict(item), ensure_ascii=False) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+
+class OutboxWorker:
+    """Background thread that delivers pending outbox items until ``finish`` is called."""
+
+    def __init__(self, outbox: Outbox, handlers: dict[str, Handler], log: LogWriter) -> None:
+        self._outbox = outbox
+        self._handlers = handlers
+        self._log = log
+        self._closing = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="outbox", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def finish(self, timeout: float | None = None) -> None:
+        """Stop accepting new work once the queue is drained and wait for the thread."""
+        self._closing.set()
+        self._outbox.notify()
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._outbox.compact()
+
+    def _run(self) -> None:
+        tries: dict[str, int] = {}  # attempts made by this run
+        retry_at: dict[str, float] = {}
+        while True:
+            now = time.monotonic()
+            due = [
+                item
+                for item in self._outbox.pending()
+                if tries.get(item.id, 0) < RUN_ATTEMPTS and retry_at.get(item.id, 0.0) <= now
+            ]
+            for item in due:
+                tries[item.id] = tries.get(item.id, 0) + 1
+                if self._deliver(item):
+                    continue
+                retry_at[item.id] = time.monotonic() + RETRY_DELAY_S * 2 ** (tries[item.id] - 1)
+
+            waiting = [
+                retry_at.get(item.id, 0.0)
+                for item in self._outbox.pending()
+                if tries.get(item.id, 0) < RUN_ATTEMPTS
+            ]
+            if not waiting and self._closing.is_set():
+                return
+            delay = max(0.0, min(waiting) - time.monotonic()) if waiting else None
+            self._outbox.wait(delay)
+
+    def _deliver(self, item: OutboxItem) -> bool:
+        handler = self._handlers.get(item.kind)
+        try:
+            if handler is None:
+                raise ValueError(f"no outbox handler for {item.kind!r}")
+            handler(item.payload)
+        except Exception as exc:
+            failed = self._outbox.mark_failed(item, f"{type(exc).__name__}: {exc}")
+            _safe_append(self._log, "outbox_failed", {
+                "id": item.id,
+                "kind": item.kind,
+                "attempts": failed.attempts,
+                "status": failed.status,
+                "error": failed.error,
+            })
+            return False
+        self._outbox.mark_delivered(item)
+        _safe_append(self._log, "outbox_delivered", {"id": item.id, "kind": item.kind})
+        return True
+
+
+def default_handlers(config: AppConfig) -> dict[str, Handler]:
+    """Handlers for the side effects automations queue: ``git_push`` and ``telegram_message``."""
+    settings = config.settings
+    api_base = str(settings.get("telegram_api_base") or DEFAULT_TELEGRAM_API_BASE).rstrip("/")
+
+    def git_push(payload: dict[str, Any]) -> None:
+        result = subprocess.run(
+            ["git", "push"],
+            cwd=str(payload["cwd"]),
+            check=False,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            stderr = result.stderr.strip() or result.stdout.strip()
+            detail = f": {stderr}" if stderr else ""
+            raise RuntimeError(f"Command failed (git push){detail}")
+
+    def telegram_message(payload: dict[str, Any]) -> None:
+        # The token is read at delivery time so it is never written to the outbox file
+        token = settings.get("telegram_bot_token", "")
+        if not token:
+            raise ValueError("missing telegram_bot_token")
+        resp = requests.post(
+            f"{api_base}/bot{token}/sendMessage",
+            json={"chat_id": payload["chat_id"], "text": payload["text"]},
+            timeout=30,
+        )
+        resp.raise_for_status()
+
+    return {"git_push": git_push, "telegram_message": telegram_message}
+
+
+def _load_items(path: Path) -> dict[str, OutboxItem]:
+    items: dict[str, OutboxItem] = {}
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return items
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            item = OutboxItem(**json.loads(line))
+        except (json.JSONDecodeError, TypeError):
+            continue
+        items[item.id] = item
+    return items
+
+
+def _safe_append(log: LogWriter, event: str, payload: dict[str, Any]) -> None:
+    try:
+        log.append("outbox", event, payload)
+    except Exception:
+        return
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
+from typing import Any, Iterable, Iterator
+
+_umask_lock = threading.Lock()
+_umask: int | None = None
+
+
+@dataclass(frozen=True)
+class WriteStats:
+    written: int
+    unchanged: int
+
+
+class OutputWriter:
+    """Writes generated files atomically, and only when their content changed.
+
+    Unchanged files keep their mtime, so Obsidian, sync clients and file watchers
+    do not see a modification.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._written = 0
+        self._unchanged = 0
+
+    @property
+    def stats(self) -> WriteStats:
+        with self._lock:
+            return WriteStats(written=self._written, unchanged=self._unchanged)
+
+    def write_text(self, path: Path, text: str, encoding: str = "utf-8") -> bool:
+        return self.write_bytes(path, text.encode(encoding))
+
+    def write_bytes(self, path: Path, data: bytes) -> bool:
+        """Write ``data`` to ``path`` unless it already holds exactly these bytes.
+
+        Returns True when the file was (re)written.
+        """
+        if _file_digest(path, expected_size=len(data)) == hashlib.sha256(data).hexdigest():
+            self._count(written=False)
+            return False
+        return self.write_chunks(path, [data])
+
+    def write_chunks(self, path: Path, chunks: Iterable[str | bytes], encoding: str = "utf-8") -> bool:
+        """Stream chunks into a temp file next to ``path`` and swap it in if the content differs."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        tmp_path = Path(tmp_name)
+        try:
+            digest = hashlib.sha256()
+            size = 0
+            with os.fdopen(fd, "wb") as handle:
+                for chunk in chunks:
+                    data = chunk.encode(encoding) if isinstance(chunk, str) else chunk
+                    digest.update(data)
+                    size += len(data)
+                    handle.write(data)
+            if _file_digest(path, expected_size=size) == digest.hexdigest():
+                tmp_path.unlink()
+                self._count(written=False)
+                return False
+            os.chmod(tmp_path, _target_mode(path))
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._count(written=True)
+        return True
+
+    def _count(self, written: bool) -> None:
+        with self._lock:
+            if written:
+                self._written += 1
+            else:
+                self._unchanged += 1
+
+
+@contextmanager
+def atomic_path(path: Path) -> Iterator[Path]:
+    """Yield a temp path next to ``path`` and move it into place when the block succeeds.
+
+    For caches and files produced by other libraries (Pillow, gzip) that are not routed
+    through :class:`OutputWriter`. The temp file is removed if the block raises.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        yield tmp_path
+        os.chmod(tmp_path, _target_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_json_atomic(path: Path, data: Any, indent: int | None = None) -> None:
+    """Replace ``path`` with ``data`` as JSON in one step, so readers never see half a file."""
+    with atomic_path(path) as tmp_path:
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=indent), encoding="utf-8")
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _file_digest(path: Path, expected_size: int) -> str | None:
+    """sha256 of ``path``, or None when it is missing or its size already differs."""
+    try:
+        if path.stat().st_size != expected_size:
+            return None
+        return file_sha256(path)
+    except OSError:
+        return None
+
+
+def _target_mode(path: Path) -> int:
+    try:
+        return path.stat().st_mode & 0o777
+    except OSError:
+        return 0o666 & ~_process_umask()
+
+
+def _process_umask() -> int:
+    """The process umask, read once on first use."""
+    global _umask
+    with _umask_lock:
+        if _umask is None:
+            _umask = _read_umask()
+        return _umask
+
+
+def _read_umask() -> int:
+    # Linux reports the umask without changing it; elsewhere it can only be read by setting it
+    try:
+        for line in Path("/proc/self/status").read_text(encoding="ascii").splitlines():
+            if line.startswith("Umask:"):
+                return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
@@ -2,9 +2,11 @@ from __future__ import annotations
 
 from .automations import (
     DailyRepoMaintainAutomation,
+    EssayExportAutomation,
     GitCommitTrackerAutomation,
     ObsidianMarkdownCountAutomation,
     ObsidianEditTrackerAutomation,
+    ProjectCardsAutomation,
     ProjectCommandCenterAutomation,
     ProgressToHundredAutomation,
     PublishPortfolioFromObsAutomation,
@@ -21,10 +23,12 @@ from .automations.base import Automation
 def load_automations() -> list[Automation]:
     return [
         DailyRepoMaintainAutomation(),
+        EssayExportAutomation(),
         GitCommitTrackerAutomation(),
         ObsidianMarkdownCountAutomation(),
         ObsidianEditTrackerAutomation(),
         ProjectCommandCenterAutomation(),
+        ProjectCardsAutomation(),
         ProgressToHundredAutomation(),
         PublishPortfolioFromObsAutomation(),
         RandomArtAutomation(),
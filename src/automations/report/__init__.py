@@ -1,3 +1,15 @@
+from .fragments import WIDGETS, FragmentCache, Widget
 from .html import render_dashboard
+from .raster import render_dashboard_image
+from .templates import TemplateService, configure_templates, template_service
 
-__all__ = ["render_dashboard"]
+__all__ = [
+    "FragmentCache",
+    "TemplateService",
+    "WIDGETS",
+    "Widget",
+    "configure_templates",
+    "render_dashboard",
+    "render_dashboard_image",
+    "template_service",
+]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from ..output_writer import write_json_atomic
+from .templates import template_service
+
+MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Widget:
+    name: str  # template widgets/<name>.html
+    fields: tuple[str, ...]  # DashboardDTO.to_dict() keys the template reads
+
+
+# In page order; template.html places each one through ``widgets.<name>``
+WIDGETS = (
+    Widget("timestamp", ("generated_at",)),
+    Widget("artwork", ("artwork_image_path", "artwork_filename")),
+    Widget("stats", ("active_repos", "vault_notes", "zk_percentage", "leaf_percentage", "location_count")),
+    Widget("focus", ("focus", "repo_to_maintain")),
+    Widget("activity", ("heatmap_colors", "obs_edits_colors", "weekly_portfolio_commit", "weekly_main_commit")),
+    Widget("progress", ("progress_bars",)),
+    Widget("random_project", ("random_project_name", "random_project_image_path")),
+)
+
+
+@dataclass
+class FragmentStats:
+    rendered: list[str] = field(default_factory=list)
+    reused: list[str] = field(default_factory=list)
+
+
+class FragmentCache:
+    """Rendered widget fragments, persisted between runs.
+
+    Each fragment is keyed by the hash of the widget's inputs (its slice of the dashboard
+    data) and of its template file, so a run only re-renders the widgets whose automation
+    payloads changed; the page is then assembled from the cached pieces.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self.stats = FragmentStats()
+        self._fragments = _load_manifest(path) if path is not None else {}
+        self._dirty = False
+
+    def render(self, template_dir: Path, widget: Widget, data: dict[str, Any]) -> str:
+        context = {name: data[name] for name in widget.fields}
+        template_name = f"widgets/{widget.name}.html"
+        key = _fragment_key(template_dir / template_name, context)
+        cached = self._fragments.get(widget.name)
+        if cached is not None and cached.get("key") == key:
+            self.stats.reused.append(widget.name)
+            return cached["html"]
+        html = template_service().render(template_dir, template_name, **context)
+        self._fragments[widget.name] = {"key": key, "html": html}
+        self._dirty = True
+        self.stats.rendered.append(widget.name)
+        return html
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        write_json_atomic(self.path, {"version": MANIFEST_VERSION, "fragments": self._fragments})
+        self._dirty = False
+
+
+def _fragment_key(template_path: Path, context: dict[str, Any]) -> str:
+    stat = template_path.stat()
+    payload = json.dumps(
+        [stat.st_mtime_ns, stat.st_size, context],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _load_manifest(path: Path) -> dict[str, dict[str, str]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    fragments = data.get("fragments")
+    return fragments if isinstance(fragments, dict) else {}
@@ -2,14 +2,20 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from jinja2 import Environment, FileSystemLoader
-
 from ..dto import DashboardDTO
+from .fragments import WIDGETS, FragmentCache
+from .templates import template_service
+
+TEMPLATE_DIR = Path(__file__).parent
+
 
+def render_dashboard(dto: DashboardDTO, cache: FragmentCache | None = None) -> str:
+    """Render dashboard HTML from DTO: each widget fragment, then the page around them.
 
-def render_dashboard(dto: DashboardDTO) -> str:
-    """Render dashboard HTML from DTO using Jinja2 template."""
-    template_dir = Path(__file__).parent
-    env = Environment(loader=FileSystemLoader(str(template_dir)))
-    template = env.get_template("template.html")
-    return template.render(**dto.to_dict())
+    With a ``cache``, widgets whose inputs did not change since the last render are
+    taken from it instead of being rendered again.
+    """
+    cache = cache if cache is not None else FragmentCache()
+    data = dto.to_dict()
+    widgets = {widget.name: cache.render(TEMPLATE_DIR, widget, data) for widget in WIDGETS}
+    return template_service().render(TEMPLATE_DIR, "template.html", widgets=widgets)
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, ImageDraw, ImageFont
+
+from ..dto import DashboardDTO
+
+# Bump when the drawing code changes, so cached wallpapers are re-rendered.
+LAYOUT_VERSION = 1
+
+# Layout constants mirror the CSS in template.html (logical px at 2560x1600).
+BASE_WIDTH = 2560
+BASE_HEIGHT = 1600
+PADDING = 64
+GAP = 48
+COLUMNS = 4
+
+BACKGROUND = "#0f172a"
+CARD_BACKGROUND = "#111827"
+CARD_BORDER = "#1f2937"
+MUTED = "#64748b"
+LABEL = "#94a3b8"
+VALUE = "#f1f5f9"
+CHECK = "#7bc96f"
+BAR_BACKGROUND = "#1e293b"
+BAR_SEGMENTS = (("older", "#64748b"), ("week", "#5eead4"), ("today", "#a78bfa"))
+
+FONT_CANDIDATES = ("DejaVuSans.ttf", "LiberationSans-Regular.ttf", "Arial.ttf")
+BOLD_FONT_CANDIDATES = ("DejaVuSans-Bold.ttf", "LiberationSans-Bold.ttf", "Arial Bold.ttf")
+
+
+def render_dashboard_image(dto: DashboardDTO, width: int, height: int) -> Image.Image:
+    """Draw the dashboard straight from the DTO, following the layout of template.html."""
+    painter = _Painter(width, height, scale=width / BASE_WIDTH)
+    data = dto.to_dict()
+
+    column_width = (BASE_WIDTH - 2 * PADDING - (COLUMNS - 1) * GAP) / COLUMNS
+    columns = [_draw_left_column, _draw_heatmap_column]
+    if data["progress_bars"]:
+        columns.append(_draw_progress_column)
+    if data["random_project_image_path"]:
+        columns.append(_draw_project_column)
+
+    # Like the CSS grid: present columns fill the cells left to right.
+    for index, draw_column in enumerate(columns):
+        x = PADDING + index * (column_width + GAP)
+        draw_column(painter, data, x, PADDING, column_width)
+    return painter.image
+
+
+class _Painter:
+    def __init__(self, width: int, height: int, scale: float) -> None:
+        self.scale = scale
+        self.image = Image.new("RGB", (width, height), BACKGROUND)
+        self.draw = ImageDraw.Draw(self.image)
+        self.content_height = BASE_HEIGHT - 2 * PADDING
+
+    def px(self, value: float) -> int:
+        return round(value * self.scale)
+
+    def font(self, size: float, bold: bool = False) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+        return load_font(max(1, self.px(size)), bold)
+
+    def text_width(self, text: str, size: float, bold: bool = False, spacing: float = 0.0) -> float:
+        font = self.font(size, bold)
+        width = self.draw.textlength(text, font=font) / self.scale
+        return width + spacing * size * max(0, len(text) - 1)
+
+    def text(
+        self,
+        x: float,
+        y: float,
+        text: str,
+        size: float,
+        fill: str,
+        bold: bool = False,
+        spacing: float = 0.0,
+    ) -> None:
+        """Draw text with its top at ``y``; ``spacing`` is CSS letter-spacing in em."""
+        font = self.font(size, bold)
+        if not spacing:
+            self.draw.text((self.px(x), self.px(y)), text, font=font, fill=fill)
+            return
+        cursor = x
+        for char in text:
+            self.draw.text((self.px(cursor), self.px(y)), char, font=font, fill=fill)
+            cursor += self.draw.textlength(char, font=font) / self.scale + spacing * size
+
+    def card(self, x: float, y: float, width: float, height: float) -> None:
+        self.draw.rounded_rectangle(
+            (self.px(x), self.px(y), self.px(x + width), self.px(y + height)),
+            radius=self.px(12),
+            fill=CARD_BACKGROUND,
+            outline=CARD_BORDER,
+            width=max(1, self.px(1)),
+        )
+
+    def rect(self, x: float, y: float, width: float, height: float, fill: str, radius: float = 0) -> None:
+        box = (self.px(x), self.px(y), self.px(x + width) - 1, self.px(y + height) - 1)
+        if box[2] < box[0] or box[3] < box[1]:
+            return
+        if radius:
+            self.draw.rounded_rectangle(box, radius=self.px(radius), fill=fill)
+        else:
+            self.draw.rectangle(box, fill=fill)
+
+    def paste_image(
+        self,
+        path: str,
+        x: float,
+        y: float,
+        max_width: float,
+        max_height: float,
+        center: bool = False,
+        radius: float = 0,
+        fill_width: bool = False,
+    ) -> float:
+        """Paste the image scaled to fit the box; returns the height used (logical px)."""
+        image = _load_image(path, self.px(max_width), self.px(max_height), fill_width)
+        if image is None:
+            return 0.0
+        width, height = image.size
+        left = self.px(x) + ((self.px(max_width) - width) // 2 if center else 0)
+        mask = None
+        if radius:
+            mask = Image.new("L", image.size, 0)
+            ImageDraw.Draw(mask).rounded_rectangle((0, 0, width - 1, height - 1), radius=self.px(radius), fill=255)
+        self.image.paste(image, (left, self.px(y)), mask)
+        return height / self.scale
+
+
+def _draw_left_column(painter: _Painter, data: dict[str, Any], x: float, y: float, width: float) -> None:
+    painter.text(x, y, data["generated_at"].upper(), 10, MUTED, spacing=0.15)
+    y += 12 + 32
+
+    if data["artwork_image_path"]:
+        y += painter.paste_image(
+            data["artwork_image_path"], x, y, width, BASE_HEIGHT / 3, center=True
+        )
+    filename = data["artwork_filename"]
+    filename_width = painter.text_width(filename, 9, spacing=0.1)
+    painter.text(x + (width - filename_width) / 2, y + 12, filename, 9, MUTED, spacing=0.1)
+    y += 12 + 11 + 16
+
+    rows = [
+        ("Active Repos", data["active_repos"]),
+        ("Vault Notes", data["vault_notes"]),
+        ("% in ZK", data["zk_percentage"]),
+        ("% Leaves", data["leaf_percentage"]),
+        ("Unedited Book Notes", data["location_count"]),
+    ]
+    row_height = 12 + 34 + 12
+    label_width = max(painter.text_width(label.upper(), 10, spacing=0.12) for label, _ in rows)
+    value_width = max(painter.text_width(str(value), 28, bold=True) for _, value in rows)
+    card_height = 2 * 24 + len(rows) * row_height
+    painter.card(x, y, width, card_height)
+    for index, (label, value) in enumerate(rows):
+        row_y = y + 24 + index * row_height
+        painter.text(x + 24, row_y + 12 + 11, label.upper(), 10, LABEL, spacing=0.12)
+        value_text = str(value)
+        value_x = x + 24 + label_width + 24 + value_width - painter.text_width(value_text, 28, bold=True)
+        painter.text(value_x, row_y + 12, value_text, 28, VALUE, bold=True)
+    y += card_height
+
+    for prefix, value in (("focus", data["focus"]), ("maintain", data["repo_to_maintain"])):
+        if value:
+            painter.text(x, y + 16, f"{prefix}: {value}", 14, LABEL)
+            y += 16 + 17
+
+
+def _draw_heatmap_column(painter: _Painter, data: dict[str, Any], x: float, y: float, width: float) -> None:
+    painter.card(x, y, width, painter.content_height)
+    rows: list[tuple[str, Any]] = [
+        ("Commit Activity", data["heatmap_colors"]),
+        ("Obs Edits", data["obs_edits_colors"]),
+        ("Portfolio Commits", data["weekly_portfolio_commit"]),
+        ("Main Repo Commits", data["weekly_main_commit"]),
+    ]
+    label_width = max(painter.text_width(label.upper(), 10, spacing=0.12) for label, _ in rows)
+    row_y = y + 24
+    for label, value in rows:
+        row_height = 12 + 20 + 12
+        painter.text(x + 24, row_y + 12 + 5, label.upper(), 10, LABEL, spacing=0.12)
+        value_x = x + 24 + label_width + 24
+        if isinstance(value, list):
+            for index, color in enumerate(value):
+                if color != "transparent":
+                    painter.rect(value_x + index * 22, row_y + 12, 20, 20, color)
+        elif value:
+            painter.text(value_x, row_y + 12, value, 16, CHECK, bold=True)
+        row_y += row_height
+
+
+def _draw_progress_column(painter: _Painter, data: dict[str, Any], x: float, y: float, width: float) -> None:
+    for bar in data["progress_bars"]:
+        painter.text(x, y, str(bar.get("title", "")).upper(), 10, LABEL, spacing=0.12)
+        y += 12 + 8
+        painter.rect(x, y, width, 20, BAR_BACKGROUND, radius=4)
+        segment_x = x
+        for key, color in BAR_SEGMENTS:
+            segment_width = width * float(bar.get(key, 0) or 0) / 100
+            painter.rect(segment_x, y, segment_width, 20, color)
+            segment_x += segment_width
+        y += 20 + 16
+
+
+def _draw_project_column(painter: _Painter, data: dict[str, Any], x: float, y: float, width: float) -> None:
+    painter.text(x, y, data["random_project_name"].upper(), 10, MUTED, spacing=0.15)
+    y += 12 + 32 + 16
+    painter.paste_image(
+        data["random_project_image_path"],
+        x,
+        y,
+        width,
+        painter.content_height - (y - PADDING),
+        radius=12,
+        fill_width=True,
+    )
+
+
+@lru_cache(maxsize=64)
+def load_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    """First available sans font at ``size`` px, falling back to Pillow's built-in font."""
+    for name in BOLD_FONT_CANDIDATES if bold else FONT_CANDIDATES:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size)
+
+
+def _load_image(path: str, max_width: int, max_height: int, fill_width: bool = False) -> Image.Image | None:
+    """Decode an image no larger than the box; ``fill_width`` also scales small images up."""
+    source = Path(path)
+    if not source.is_file() or source.suffix.lower() == ".svg":
+        return None
+    try:
+        with Image.open(source) as image:
+            image.draft("RGB", (max_width, max_height))
+            image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+            if fill_width and image.width < max_width:
+                height = min(max_height, round(image.height * max_width / image.width))
+                image = image.resize((max_width, height), Image.Resampling.LANCZOS)
+            image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+            if image.mode == "RGBA":
+                flattened = Image.new("RGB", image.size, BACKGROUND)
+                flattened.paste(image, mask=image.getchannel("A"))
+                return flattened
+            return image
+    except (OSError, Image.DecompressionBombError):
+        return None
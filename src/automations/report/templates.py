@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+import shutil
+import threading
+from typing import Any
+
+import jinja2
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, ModuleLoader, Template
+
+from ..output_writer import OutputWriter
+
+
+class TemplateService:
+    """Process-wide Jinja environments, one per template directory.
+
+    Parsed templates stay in the environment's cache for the life of the process. With
+    a cache dir, compiled bytecode is also persisted between runs; with ``precompile``
+    templates are compiled to Python modules once and loaded through ``ModuleLoader``.
+    """
+
+    def __init__(self, cache_dir: Path | None = None, precompile: bool = False) -> None:
+        self.cache_dir = cache_dir
+        self.precompile = precompile and cache_dir is not None
+        self._lock = threading.Lock()
+        self._environments: dict[Path, Environment] = {}
+
+    def environment(self, template_dir: Path) -> Environment:
+        template_dir = template_dir.resolve()
+        with self._lock:
+            env = self._environments.get(template_dir)
+            if env is None:
+                env = self._build_environment(template_dir)
+                self._environments[template_dir] = env
+            return env
+
+    def get_template(self, template_dir: Path, name: str) -> Template:
+        return self.environment(template_dir).get_template(name)
+
+    def render(self, template_dir: Path, name: str, **context: Any) -> str:
+        return self.get_template(template_dir, name).render(**context)
+
+    def render_to_file(
+        self,
+        template_dir: Path,
+        name: str,
+        path: Path,
+        output: OutputWriter,
+        **context: Any,
+    ) -> bool:
+        """Stream the rendered template into ``path`` without building the whole string."""
+        template = self.get_template(template_dir, name)
+        return output.write_chunks(path, template.generate(**context))
+
+    def _build_environment(self, template_dir: Path) -> Environment:
+        source_env = Environment(
+            loader=FileSystemLoader(str(template_dir)),
+            bytecode_cache=self._bytecode_cache(),
+        )
+        if not self.precompile:
+            return source_env
+        module_dir = self._compile_modules(source_env, template_dir)
+        return Environment(loader=ModuleLoader(str(module_dir)))
+
+    def _bytecode_cache(self) -> FileSystemBytecodeCache | None:
+        if self.cache_dir is None:
+            return None
+        bytecode_dir = self.cache_dir / "bytecode"
+        bytecode_dir.mkdir(parents=True, exist_ok=True)
+        return FileSystemBytecodeCache(str(bytecode_dir))
+
+    def _compile_modules(self, source_env: Environment, template_dir: Path) -> Path:
+        """Compile every template in ``template_dir`` to modules, unless they are current."""
+        assert self.cache_dir is not None
+        dir_key = hashlib.sha256(str(template_dir).encode("utf-8")).hexdigest()[:16]
+        module_dir = self.cache_dir / "modules" / dir_key
+        stamp_path = module_dir / "stamp.json"
+        stamp = _source_stamp(template_dir)
+        try:
+            current = json.loads(stamp_path.read_text(encoding="utf-8")) == stamp
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            current = False
+        if not current:
+            shutil.rmtree(module_dir, ignore_errors=True)
+            module_dir.mkdir(parents=True, exist_ok=True)
+            source_env.compile_templates(
+                str(module_dir),
+                filter_func=lambda name: name.endswith(".html"),
+                zip=None,
+                ignore_errors=False,
+            )
+            stamp_path.write_text(json.dumps(stamp), encoding="utf-8")
+        return module_dir
+
+
+def _source_stamp(template_dir: Path) -> dict[str, Any]:
+    files = {
+        str(path.relative_to(template_dir)): [path.stat().st_mtime_ns, path.stat().st_size]
+        for path in sorted(template_dir.rglob("*.html"))
+    }
+    return {"jinja": jinja2.__version__, "files": files}
+
+
+_service = TemplateService()
+_service_lock = threading.Lock()
+
+
+def template_service() -> TemplateService:
+    return _service
+
+
+def configure_templates(cache_dir: Path | None, precompile: bool = False) -> TemplateService:
+    """Set up the shared service; environments are kept when the settings are unchanged."""
+    global _service
+    with _service_lock:
+        if _service.cache_dir != cache_dir or _service.precompile != (precompile and cache_dir is not None):
+            _service = TemplateService(cache_dir=cache_dir, precompile=precompile)
+        return _service
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 from .config import AppConfig
@@ -8,9 +9,14 @@ from .context import AutomationContext
 from .dto import DashboardDTO
 from .logging.log_writer import LogWriter
 from .models import AutomationResult, RunSummary
+from .outbox import Outbox, OutboxWorker, default_handlers
+from .output_writer import OutputWriter
 from .registry import load_automations
+from .report.fragments import FragmentCache, FragmentStats
 from .report.html import render_dashboard
+from .report.templates import configure_templates
 from .services.registry import ServiceRegistry
+from .snapshots import SnapshotStore, snapshot_fallbacks
 
 
 def run_automations(
@@ -22,7 +28,15 @@ def run_automations(
 
     log_root = config.project_root / "runtime" / "logs"
     log = LogWriter(log_root, run_date, run_id)
-    services = ServiceRegistry(config.services)
+    configure_templates(
+        config.cache_root / "jinja",
+        precompile=bool(config.settings.get("precompile_templates", False)),
+    )
+    services = ServiceRegistry(config.services, cache_root=config.cache_root)
+    snapshots = _snapshot_store(config)
+    previous = snapshots.fallbacks()
+    output = OutputWriter()
+    outbox = Outbox(config.project_root / "runtime" / "outbox")
     ctx = AutomationContext(
         config=config,
         services=services,
@@ -30,23 +44,45 @@ def run_automations(
         run_date=run_date,
         run_id=run_id,
         force_flags=force_flags,
+        output=output,
+        outbox=outbox,
     )
 
     automations = load_automations()
     primary = [automation for automation in automations if automation.spec.stage == "primary"]
+    dashboard_inputs = [automation for automation in primary if automation.spec.feeds_dashboard]
+    background = [automation for automation in primary if not automation.spec.feeds_dashboard]
     post_report = [automation for automation in automations if automation.spec.stage == "post_report"]
     _safe_log_run(log, "run_start", {"run_id": run_id, "automation_count": len(automations)})
 
     results: list[AutomationResult] = []
     warnings: list[str] = []
 
-    for automation in primary:
+    for automation in dashboard_inputs:
         result = _run_single(automation, ctx)
         results.append(result)
         if result.status == "error" and result.message:
             warnings.append(f"{result.automation_id}: {result.message}")
 
-    report_path = _write_dashboard(config, results, datetime.now())
+    # Side-effect automations (deploys, exports, messages) run alongside the report and
+    # post_report stage, so the wallpaper does not wait for them. They start after the
+    # dashboard inputs, whose outputs some of them read.
+    executor = ThreadPoolExecutor(max_workers=max(1, len(background)), thread_name_prefix="automation")
+    futures = [executor.submit(_run_single, automation, ctx) for automation in background]
+
+    # Failed dashboard inputs fall back to their payload from the previous run's snapshot
+    fallbacks = {
+        result.automation_id: previous[result.automation_id]
+        for result in results
+        if result.status == "error" and result.automation_id in previous
+    }
+    for automation_id, fallback in fallbacks.items():
+        warnings.append(f"{automation_id}: showing data from run {fallback.run_id}")
+    dashboard = _build_dto(results, datetime.now(), {key: value.payload for key, value in fallbacks.items()})
+    report_path, fragment_stats = _write_dashboard(config, dashboard, output)
+    # Network side effects queued by the primaries go out while post_report automations run
+    worker = OutboxWorker(outbox, default_handlers(config), log)
+    worker.start()
     if not report_path:
         warnings.append("Report generation failed; see run log for details")
     else:
@@ -57,7 +93,10 @@ def run_automations(
             run_date=run_date,
             run_id=run_id,
             report_path=report_path,
+            dashboard=dashboard,
             force_flags=force_flags,
+            output=output,
+            outbox=outbox,
         )
 
     for automation in post_report:
@@ -66,6 +105,19 @@ def run_automations(
         if result.status == "error" and result.message:
             warnings.append(f"{result.automation_id}: {result.message}")
 
+    for future in futures:
+        result = future.result()
+        results.append(result)
+        if result.status == "error" and result.message:
+            warnings.append(f"{result.automation_id}: {result.message}")
+    executor.shutdown()
+    # Report results in registry order, whichever stage or thread produced them
+    order = {automation.spec.id: index for index, automation in enumerate(automations)}
+    results.sort(key=lambda result: order[result.automation_id])
+
+    worker.finish(timeout=float(config.settings.get("outbox_timeout", 60)))
+    outbox_stats = outbox.stats
+    write_stats = output.stats
     _safe_log_run(
         log,
         "run_complete",
@@ -73,14 +125,56 @@ def run_automations(
             "run_id": run_id,
             "report_path": report_path,
             "warnings": warnings,
+            "files_written": write_stats.written,
+            "files_unchanged": write_stats.unchanged,
+            "widgets_rendered": fragment_stats.rendered,
+            "widgets_reused": fragment_stats.reused,
+            "outbox_queued": outbox_stats.queued,
+            "outbox_delivered": outbox_stats.delivered,
+            "outbox_pending": outbox_stats.pending,
         },
     )
 
-    return RunSummary(
+    summary = RunSummary(
         results=tuple(results),
         report_path=str(report_path) if report_path else None,
         warnings=tuple(warnings),
+        files_written=write_stats.written,
+        files_unchanged=write_stats.unchanged,
+        outbox_queued=outbox_stats.queued,
+        outbox_delivered=outbox_stats.delivered,
+        outbox_pending=outbox_stats.pending,
+    )
+    try:
+        snapshots.save(run_id, summary, fallbacks)
+    except Exception as exc:
+        _safe_log_run(log, "snapshot_error", {"run_id": run_id, "error": f"{type(exc).__name__}: {exc}"})
+    return summary
+
+
+def render_from_snapshot(config: AppConfig, run_id: str | None = None) -> Path:
+    """Rebuild the dashboard from a stored run (the latest by default) without running automations."""
+    snapshots = _snapshot_store(config)
+    snapshot = snapshots.load(run_id)
+    if snapshot is None:
+        raise FileNotFoundError(f"No snapshot for run {run_id}" if run_id else "No run snapshot found")
+    configure_templates(
+        config.cache_root / "jinja",
+        precompile=bool(config.settings.get("precompile_templates", False)),
     )
+    results = snapshots.results(snapshot)
+    fallbacks = {key: value.payload for key, value in snapshot_fallbacks(snapshot).items()}
+    finished = [result.finished_at for result in results if result.finished_at]
+    generated_at = max(finished) if finished else datetime.fromisoformat(snapshot["saved_at"])
+    report_path, _ = _write_dashboard(config, _build_dto(results, generated_at, fallbacks), OutputWriter())
+    if report_path is None:
+        raise RuntimeError("Report generation failed")
+    return report_path
+
+
+def _snapshot_store(config: AppConfig) -> SnapshotStore:
+    keep = int(config.settings.get("snapshot_keep", 30))
+    return SnapshotStore(config.project_root / "runtime" / "snapshots", keep=keep)
 
 
 def _run_single(automation, ctx: AutomationContext) -> AutomationResult:
@@ -123,23 +217,35 @@ def _log_result(log: LogWriter, result: AutomationResult) -> None:
     _safe_log_run(log, "automation_result", {"automation_id": result.automation_id, **payload})
 
 
-def _write_dashboard(config: AppConfig, results: list[AutomationResult], generated_at: datetime) -> Path | None:
-    """Build DTO from results and render dashboard HTML."""
-    dto = _build_dto(results, generated_at)
-    html = render_dashboard(dto)
+def _write_dashboard(
+    config: AppConfig,
+    dto: DashboardDTO,
+    output: OutputWriter,
+) -> tuple[Path | None, FragmentStats]:
+    """Render dashboard HTML from the DTO, re-rendering only widgets whose inputs changed.
+
+    Returns the report path (None when writing failed) and which widgets were re-rendered.
+    """
+    fragments = FragmentCache(config.cache_root / "report" / "fragments.json")
+    html = render_dashboard(dto, fragments)
     output_html = config.project_root / "output" / "stats.html"
     try:
-        output_html.parent.mkdir(parents=True, exist_ok=True)
-        output_html.write_text(html, encoding="utf-8")
+        output.write_text(output_html, html)
+        fragments.save()
     except Exception:
-        return None
-    return output_html
+        return None, fragments.stats
+    return output_html, fragments.stats
 
 
-def _build_dto(results: list[AutomationResult], generated_at: datetime) -> DashboardDTO:
-    """Build dashboard DTO from automation results."""
-    # Create map of automation_id → payload (only successful results)
-    data_map = {r.automation_id: r.payload for r in results if r.status == "ok"}
+def _build_dto(
+    results: list[AutomationResult],
+    generated_at: datetime,
+    fallbacks: dict[str, dict] | None = None,
+) -> DashboardDTO:
+    """Build dashboard DTO from automation results, as of ``generated_at``."""
+    # Create map of automation_id → payload (successful results, else a stored fallback)
+    data_map = dict(fallbacks or {})
+    data_map.update({r.automation_id: r.payload for r in results if r.status == "ok"})
 
     # Extract data from specific automations with fallbacks
     git_data = data_map.get("git_commit_tracker", {})
@@ -155,8 +261,8 @@ def _build_dto(results: list[AutomationResult], generated_at: datetime) -> Dashb
 
     # Convert daily_commits dict to list of 14 counts
     daily_commits = git_data.get("daily_commits", {})
-    from datetime import date, timedelta
-    today = date.today()
+    # The heatmap window ends on the dashboard's own date, so a snapshot re-render shows its day
+    today = generated_at.date()
     commit_heatmap = [
         daily_commits.get((today - timedelta(days=i)).strftime("%Y-%m-%d"), 0)
         for i in range(13, -1, -1)
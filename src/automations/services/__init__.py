@@ -1,5 +1,43 @@
-from .github import GitHubClient, GitHubRepoCount
-from .obsidian import count_markdown_files, count_location_occurrences
+from .asset_sync import AssetSyncResult, sync_assets
+from .browser import BrowserError, HeadlessBrowser
+from .github import (
+    GitHubClient,
+    GitHubIdentity,
+    GitHubRepoCount,
+    RateLimitBudget,
+    RepoRecord,
+    resolve_github_identities,
+)
+from .github_catalog import RepoCatalog, merge_repo_records
+from .github_mirror import GitHubRepoMirror, MirrorSync
+from .obsidian import (
+    WikiLink,
+    count_location_occurrences,
+    count_markdown_files,
+    parse_wikilinks,
+    read_frontmatter,
+)
 from .registry import ServiceRegistry
 
-__all__ = ["GitHubClient", "GitHubRepoCount", "ServiceRegistry", "count_markdown_files", "count_location_occurrences"]
+__all__ = [
+    "AssetSyncResult",
+    "BrowserError",
+    "GitHubClient",
+    "GitHubIdentity",
+    "GitHubRepoCount",
+    "GitHubRepoMirror",
+    "HeadlessBrowser",
+    "MirrorSync",
+    "RateLimitBudget",
+    "RepoCatalog",
+    "RepoRecord",
+    "ServiceRegistry",
+    "WikiLink",
+    "count_location_occurrences",
+    "count_markdown_files",
+    "merge_repo_records",
+    "parse_wikilinks",
+    "read_frontmatter",
+    "resolve_github_identities",
+    "sync_assets",
+]
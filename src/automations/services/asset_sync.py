@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import errno
+import fcntl
+import os
+from pathlib import Path
+import shutil
+from typing import Iterable, Mapping
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+SYNC_METHODS = ("reflink", "hardlink", "copy_file_range", "copy")
+# Errors that mean "this method does not work here", as opposed to a real I/O failure
+_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.ENOSYS,
+    errno.EMLINK,
+    errno.EOPNOTSUPP,
+    getattr(errno, "ENOTSUP", errno.EOPNOTSUPP),
+}
+
+
+@dataclass
+class AssetSyncResult:
+    synced: dict[str, str] = field(default_factory=dict)  # name → method used
+    unchanged: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)  # name → error
+
+
+def sync_assets(
+    files: Mapping[str, Path],
+    dest_dir: Path,
+    known: Iterable[str] | None = None,
+    hardlink: bool = True,
+) -> AssetSyncResult:
+    """Mirror ``files`` (target name → source path) into ``dest_dir``.
+
+    Targets whose size and mtime already match their source are left alone. Stale
+    targets are removed: the ``known`` names from an earlier sync that are no longer in
+    ``files``, or, when ``known`` is None, every other file in ``dest_dir``.
+    """
+    result = AssetSyncResult()
+    unsupported: set[str] = set() if hardlink else {"hardlink"}
+    for name, source in sorted(files.items()):
+        dest = dest_dir / name
+        try:
+            if _is_current(source, dest):
+                result.unchanged.append(name)
+                continue
+            dest_dir.mkdir(parents=True, exist_ok=True)
+            result.synced[name] = sync_file(source, dest, unsupported)
+        except OSError as e:
+            result.failed[name] = str(e)
+
+    if known is None:
+        known = [path.name for path in dest_dir.iterdir() if path.is_file()] if dest_dir.is_dir() else []
+    for name in sorted(set(known) - set(files)):
+        (dest_dir / name).unlink(missing_ok=True)
+        result.removed.append(name)
+    return result
+
+
+def sync_file(source: Path, dest: Path, unsupported: set[str] | None = None) -> str:
+    """Make ``dest`` a copy of ``source`` as cheaply as the filesystem allows.
+
+    Tries a reflink, a hardlink, ``copy_file_range`` and finally a plain copy (which
+    uses ``sendfile`` on Linux). ``dest`` is always replaced atomically, never written in
+    place, since it may be a hardlink to a source. Copies keep the source mtime so the
+    next sync sees them as current. Methods that fail as unsupported are added to
+    ``unsupported`` so later files skip them. Returns the method that worked.
+    """
+    if unsupported is None:
+        unsupported = set()
+    tmp_dest = dest.with_name(f".{dest.name}.tmp")
+    tmp_dest.unlink(missing_ok=True)
+    for method in SYNC_METHODS:
+        if method in unsupported:
+            continue
+        try:
+            _METHODS[method](source, tmp_dest)
+        except OSError as e:
+            tmp_dest.unlink(missing_ok=True)
+            if method == "copy" or e.errno not in _UNSUPPORTED:
+                raise
+            unsupported.add(method)
+            continue
+        if method != "hardlink":
+            stat = source.stat()
+            os.utime(tmp_dest, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp_dest, dest)
+        return method
+    raise OSError(errno.ENOTSUP, f"no sync method left for {source}")
+
+
+def _is_current(source: Path, dest: Path) -> bool:
+    source_stat = source.stat()
+    try:
+        dest_stat = dest.stat()
+    except FileNotFoundError:
+        return False
+    return dest_stat.st_size == source_stat.st_size and dest_stat.st_mtime_ns == source_stat.st_mtime_ns
+
+
+def _reflink(source: Path, dest: Path) -> None:
+    with source.open("rb") as src, dest.open("xb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def _hardlink(source: Path, dest: Path) -> None:
+    os.link(source, dest)
+
+
+def _copy_file_range(source: Path, dest: Path) -> None:
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "copy_file_range is not available")
+    with source.open("rb") as src, dest.open("xb") as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src.fileno(), dst.fileno(), min(remaining, 1 << 30))
+            if copied == 0:
+                break
+            remaining -= copied
+
+
+def _copy(source: Path, dest: Path) -> None:
+    shutil.copyfile(source, dest)
+
+
+_METHODS = {
+    "reflink": _reflink,
+    "hardlink": _hardlink,
+    "copy_file_range": _copy_file_range,
+    "copy": _copy,
+}
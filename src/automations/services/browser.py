@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import base64
+import contextlib
+import json
+import os
+from pathlib import Path
+import shutil
+import signal
+import socket
+import struct
+import subprocess
+import threading
+import time
+from typing import Any
+from urllib.parse import urlparse
+
+import requests
+
+from ..output_writer import write_json_atomic
+
+BROWSER_BINARIES = ("chromium", "chromium-browser", "google-chrome", "google-chrome-stable")
+STARTUP_TIMEOUT_SECONDS = 15.0
+COMMAND_TIMEOUT_SECONDS = 30.0
+HEALTH_TIMEOUT_SECONDS = 2.0
+STOP_TIMEOUT_SECONDS = 5.0
+
+
+class BrowserError(RuntimeError):
+    pass
+
+
+class HeadlessBrowser:
+    """A long-lived headless chromium driven over the DevTools protocol.
+
+    The browser runs in its own session with a profile under the cache dir and outlives
+    the process; its pid and port are kept in ``state_path`` so later renders and later
+    runs attach to it instead of cold-starting chromium. Every use is preceded by a
+    health check against ``/json/version``; a dead or unresponsive browser is restarted.
+    """
+
+    def __init__(self, binary: str | None, profile_dir: Path, state_path: Path) -> None:
+        self.binary = binary
+        self.profile_dir = profile_dir
+        self.state_path = state_path
+        self.restart_count = 0
+        self.last_error: str | None = None
+        self._lock = threading.Lock()
+        # The browser this instance launched, kept so it can be reaped once it exits
+        self._process: subprocess.Popen[bytes] | None = None
+
+    def screenshot(self, url: str, width: int, height: int, scale: float = 1.0) -> bytes:
+        """PNG of ``url`` at ``width``×``height`` CSS px, rendered at ``scale`` device px per px."""
+        with self._lock:
+            try:
+                return self._screenshot(self._ensure_running(), url, width, height, scale)
+            except (BrowserError, OSError) as e:
+                # One retry on a fresh browser: a hung renderer or stale socket should not fail the run
+                self.restart_count += 1
+                self.last_error = str(e)
+                self._stop()
+                return self._screenshot(self._ensure_running(), url, width, height, scale)
+
+    def close(self) -> None:
+        """Stop the browser and forget its state."""
+        with self._lock:
+            self._stop()
+
+    def _screenshot(self, ws_url: str, url: str, width: int, height: int, scale: float) -> bytes:
+        with _DevToolsConnection(ws_url) as devtools:
+            target_id = devtools.call("Target.createTarget", {"url": "about:blank"})["targetId"]
+            try:
+                session = devtools.call("Target.attachToTarget", {"targetId": target_id, "flatten": True})["sessionId"]
+                devtools.call("Page.enable", session_id=session)
+                devtools.call(
+                    "Emulation.setDeviceMetricsOverride",
+                    {"width": width, "height": height, "deviceScaleFactor": scale, "mobile": False},
+                    session_id=session,
+                )
+                devtools.call("Emulation.setScrollbarsHidden", {"hidden": True}, session_id=session)
+                navigation = devtools.call("Page.navigate", {"url": url}, session_id=session)
+                if navigation.get("errorText"):
+                    raise BrowserError(f"Navigation to {url} failed: {navigation['errorText']}")
+                devtools.wait_event("Page.loadEventFired", session_id=session)
+                result = devtools.call(
+                    "Page.captureScreenshot",
+                    {"format": "png", "fromSurface": True},
+                    session_id=session,
+                )
+            finally:
+                # Best effort: a failed close must not mask the error that got us here
+                with contextlib.suppress(BrowserError, OSError):
+                    devtools.call("Target.closeTarget", {"targetId": target_id})
+        return base64.b64decode(result["data"])
+
+    def _ensure_running(self) -> str:
+        """DevTools websocket URL of a healthy browser, launching one when needed."""
+        if self._process is not None and self._process.poll() is not None:
+            self._stop()
+            return self._launch()
+        state = self._load_state()
+        if state is not None:
+            ws_url = _probe(int(state["port"]))
+            if ws_url is not None:
+                return ws_url
+            self._stop()
+        return self._launch()
+
+    def _launch(self) -> str:
+        binary = self.binary or next((name for name in BROWSER_BINARIES if shutil.which(name)), None)
+        if binary is None or shutil.which(binary) is None:
+            raise RuntimeError("No chromium/google-chrome binary available for the devtools renderer")
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        port_file = self.profile_dir / "DevToolsActivePort"
+        port_file.unlink(missing_ok=True)
+        process = subprocess.Popen(
+            [
+                binary,
+                "--headless",
+                "--disable-gpu",
+                "--hide-scrollbars",
+                "--no-first-run",
+                "--no-default-browser-check",
+                "--remote-debugging-address=127.0.0.1",
+                "--remote-debugging-port=0",
+                f"--user-data-dir={self.profile_dir}",
+                "about:blank",
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise BrowserError(f"{binary} exited during start-up with code {process.returncode}")
+            port = _read_port(port_file)
+            if port is not None:
+                ws_url = _probe(port)
+                if ws_url is not None:
+                    self._save_state({"pid": process.pid, "port": port, "binary": binary})
+                    self._process = process
+                    return ws_url
+            time.sleep(0.05)
+        _terminate(process)
+        raise BrowserError(f"{binary} did not open its DevTools port within {STARTUP_TIMEOUT_SECONDS:.0f}s")
+
+    def _stop(self) -> None:
+        process, self._process = self._process, None
+        if process is not None:
+            _terminate(process)
+        # A browser left running by an earlier run is only known by the pid in the state file
+        state = self._load_state()
+        if state is not None:
+            try:
+                pid = int(state["pid"])
+                # The pid may have been reused since the state was written; only kill our browser
+                if _is_browser_process(pid, self.profile_dir):
+                    os.killpg(pid, signal.SIGTERM)
+            except (OSError, ValueError):
+                pass
+        self.state_path.unlink(missing_ok=True)
+
+    def _load_state(self) -> dict[str, Any] | None:
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return None
+        if not isinstance(data, dict) or "pid" not in data or "port" not in data:
+            return None
+        return data
+
+    def _save_state(self, state: dict[str, Any]) -> None:
+        write_json_atomic(self.state_path, state)
+
+
+def _terminate(process: subprocess.Popen[bytes]) -> None:
+    """Stop a browser launched by this process and reap it, so it does not linger as a zombie."""
+    if process.poll() is not None:
+        return
+    with contextlib.suppress(OSError):
+        os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=STOP_TIMEOUT_SECONDS)
+    except subprocess.TimeoutExpired:
+        with contextlib.suppress(OSError):
+            os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+
+
+def _is_browser_process(pid: int, profile_dir: Path) -> bool:
+    """Whether ``pid`` is a browser launched with ``profile_dir``, going by /proc/<pid>/cmdline."""
+    try:
+        args = Path(f"/proc/{pid}/cmdline").read_bytes().split(b"\0")
+    except OSError:
+        return False
+    return f"--user-data-dir={profile_dir}".encode() in args
+
+
+def _probe(port: int) -> str | None:
+    """Health check: the browser websocket URL if ``/json/version`` answers, else None."""
+    try:
+        response = requests.get(f"http://127.0.0.1:{port}/json/version", timeout=HEALTH_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        return str(response.json()["webSocketDebuggerUrl"])
+    except (requests.RequestException, ValueError, KeyError):
+        return None
+
+
+def _read_port(port_file: Path) -> int | None:
+    try:
+        first_line = port_file.read_text(encoding="utf-8").splitlines()[0]
+        return int(first_line)
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class _DevToolsConnection:
+    """Request/response and event handling for one DevTools websocket connection."""
+
+    def __init__(self, ws_url: str) -> None:
+        self._socket = _WebSocket(ws_url)
+        self._next_id = 0
+        self._events: list[dict[str, Any]] = []
+
+    def __enter__(self) -> _DevToolsConnection:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._socket.close()
+
+    def call(self, method: str, params: dict[str, Any] | None = None, session_id: str | None = None) -> dict[str, Any]:
+        self._next_id += 1
+        message: dict[str, Any] = {"id": self._next_id, "method": method, "params": params or {}}
+        if session_id is not None:
+            message["sessionId"] = session_id
+        self._socket.send_text(json.dumps(message))
+        deadline = time.monotonic() + COMMAND_TIMEOUT_SECONDS
+        while True:
+            reply = self._receive(deadline)
+            if reply.get("id") != self._next_id:
+                if "method" in reply:
+                    self._events.append(reply)
+                continue
+            if "error" in reply:
+                raise BrowserError(f"{method} failed: {reply['error'].get('message', reply['error'])}")
+            return reply.get("result", {})
+
+    def wait_event(self, method: str, session_id: str | None = None) -> dict[str, Any]:
+        deadline = time.monotonic() + COMMAND_TIMEOUT_SECONDS
+        while True:
+            for index, event in enumerate(self._events):
+                if event.get("method") == method and event.get("sessionId") == session_id:
+                    return self._events.pop(index).get("params", {})
+            self._events.clear()
+            message = self._receive(deadline)
+            if "method" in message:
+                self._events.append(message)
+
+    def _receive(self, deadline: float) -> dict[str, Any]:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise BrowserError("Timed out waiting for the browser")
+        return json.loads(self._socket.recv_text(timeout=remaining))
+
+
+class _WebSocket:
+    """Just enough of RFC 6455 for a local DevTools client: masked text frames out, text in."""
+
+    def __init__(self, url: str) -> None:
+        parsed = urlparse(url)
+        if parsed.scheme != "ws" or parsed.hostname is None:
+            raise BrowserError(f"Unsupported DevTools URL: {url}")
+        self._sock = socket.create_connection((parsed.hostname, parsed.port or 80), timeout=COMMAND_TIMEOUT_SECONDS)
+        self._buffer = bytearray()
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        request = (
+            f"GET {parsed.path or '/'} HTTP/1.1\r\n"
+            f"Host: {parsed.hostname}:{parsed.port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        )
+        self._sock.sendall(request.encode("ascii"))
+        while b"\r\n\r\n" not in self._buffer:
+            self._buffer += self._recv_some()
+        head, rest = bytes(self._buffer).split(b"\r\n\r\n", 1)
+        self._buffer = bytearray(rest)
+        status_line = head.split(b"\r\n", 1)[0]
+        if b" 101 " not in status_line + b" ":
+            raise BrowserError(f"DevTools websocket handshake failed: {status_line.decode(errors='replace')}")
+
+    def send_text(self, text: str) -> None:
+        self._send_frame(0x1, text.encode("utf-8"))
+
+    def recv_text(self, timeout: float) -> str:
+        self._sock.settimeout(timeout)
+        parts: list[bytes] = []
+        while True:
+            fin, opcode, payload = self._read_frame()
+            if opcode == 0x8:
+                raise BrowserError("DevTools websocket closed by the browser")
+            if opcode == 0x9:
+                self._send_frame(0xA, payload)
+                continue
+            if opcode in (0x0, 0x1, 0x2):
+                parts.append(payload)
+                if fin:
+                    return b"".join(parts).decode("utf-8")
+
+    def close(self) -> None:
+        try:
+            self._send_frame(0x8, b"")
+        except OSError:
+            pass
+        self._sock.close()
+
+    def _send_frame(self, opcode: int, payload: bytes) -> None:
+        header = bytearray([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header.append(0x80 | length)
+        elif length < 1 << 16:
+            header.append(0x80 | 126)
+            header += struct.pack("!H", length)
+        else:
+            header.append(0x80 | 127)
+            header += struct.pack("!Q", length)
+        mask = os.urandom(4)
+        masked = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+        self._sock.sendall(bytes(header) + mask + masked)
+
+    def _read_frame(self) -> tuple[bool, int, bytes]:
+        first, second = self._read_exact(2)
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", self._read_exact(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", self._read_exact(8))
+        mask = self._read_exact(4) if second & 0x80 else None
+        payload = self._read_exact(length)
+        if mask is not None:
+            payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+        return bool(first & 0x80), first & 0x0F, payload
+
+    def _read_exact(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            self._buffer += self._recv_some()
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def _recv_some(self) -> bytes:
+        try:
+            chunk = self._sock.recv(1 << 16)
+        except socket.timeout as e:
+            raise BrowserError("Timed out reading from the DevTools websocket") from e
+        if not chunk:
+            raise BrowserError("DevTools websocket closed unexpectedly")
+        return chunk
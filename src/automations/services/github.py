@@ -1,22 +1,215 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import asdict, dataclass, replace
+import random
+import sys
+import time
+from typing import Any, Callable, Iterator
 
 import requests
 
+from .http_cache import HttpCache
+
+DEFAULT_API_URL = "https://api.github.com"
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 30.0
+# Waiting longer than this for a rate-limit reset is treated as a failure instead.
+MAX_RATE_LIMIT_WAIT_SECONDS = 60.0
+
+# Only the fields RepoRecord keeps.
+OWNED_REPOS_QUERY = """
+query($cursor: String, $affiliations: [RepositoryAffiliation]) {
+  viewer {
+    repositories(
+      first: 100
+      after: $cursor
+      ownerAffiliations: $affiliations
+      orderBy: {field: UPDATED_AT, direction: DESC}
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        databaseId
+        name
+        description
+        homepageUrl
+        isArchived
+        isPrivate
+        isFork
+        parent { databaseId }
+        url
+        stargazerCount
+        pushedAt
+        updatedAt
+        owner { login }
+      }
+    }
+  }
+}
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class RepoRecord:
+    """The handful of repo fields the automations use, kept instead of the full API object."""
+
+    id: int | None
+    name: str
+    description: str
+    homepage: str
+    archived: bool
+    private: bool
+    fork: bool
+    html_url: str
+    stargazers_count: int
+    pushed_at: str
+    updated_at: str
+    owner_login: str
+    parent_id: int | None = None  # id of the repo a fork was made from
+
+    @classmethod
+    def from_api(cls, repo: dict[str, Any]) -> RepoRecord:
+        """Build a record from a REST repo object (or a dict produced by ``to_dict``)."""
+        owner = repo.get("owner")
+        owner_login = owner.get("login") if isinstance(owner, dict) else repo.get("owner_login")
+        parent = repo.get("parent")
+        parent_id = parent.get("id") if isinstance(parent, dict) else repo.get("parent_id")
+        return cls(
+            id=repo.get("id"),
+            name=_intern(repo.get("name")),
+            description=repo.get("description") or "",
+            homepage=repo.get("homepage") or "",
+            archived=bool(repo.get("archived", False)),
+            private=bool(repo.get("private", True)),
+            fork=bool(repo.get("fork", False)),
+            html_url=repo.get("html_url") or "",
+            stargazers_count=int(repo.get("stargazers_count") or 0),
+            pushed_at=_intern(repo.get("pushed_at")),
+            updated_at=_intern(repo.get("updated_at")),
+            owner_login=_intern(owner_login),
+            parent_id=parent_id,
+        )
+
+    @classmethod
+    def from_graphql(cls, node: dict[str, Any]) -> RepoRecord:
+        owner = node.get("owner") or {}
+        parent = node.get("parent") or {}
+        return cls(
+            id=node.get("databaseId"),
+            name=_intern(node.get("name")),
+            description=node.get("description") or "",
+            homepage=node.get("homepageUrl") or "",
+            archived=bool(node.get("isArchived", False)),
+            private=bool(node.get("isPrivate", True)),
+            fork=bool(node.get("isFork", False)),
+            html_url=node.get("url") or "",
+            stargazers_count=int(node.get("stargazerCount") or 0),
+            pushed_at=_intern(node.get("pushedAt")),
+            updated_at=_intern(node.get("updatedAt")),
+            owner_login=_intern(owner.get("login")),
+            parent_id=parent.get("databaseId"),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    # Mapping-style access for callers written against the raw API dicts.
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "owner":
+            return {"login": self.owner_login}
+        if key in self.__slots__:
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        if key != "owner" and key not in self.__slots__:
+            raise KeyError(key)
+        return self.get(key)
+
+
+@dataclass(frozen=True)
+class GitHubIdentity:
+    """A token plus the logins (the user and any organisations) whose repos it should list."""
+
+    username: str
+    token: str
+    owners: tuple[str, ...] = ()
+
+    @property
+    def label(self) -> str:
+        return "+".join((self.username, *self.owners))
+
 
 @dataclass(frozen=True)
 class GitHubRepoCount:
     count: int
-    repos: list[dict[str, Any]]
+    repos: list[RepoRecord]
+
+
+@dataclass
+class RateLimitBudget:
+    """Last known primary rate-limit state, taken from X-RateLimit-* response headers."""
+
+    limit: int | None = None
+    remaining: int | None = None
+    reset_at: float | None = None  # epoch seconds
+
+    def update(self, headers: Any) -> None:
+        limit = _int_header(headers, "X-RateLimit-Limit")
+        remaining = _int_header(headers, "X-RateLimit-Remaining")
+        reset_at = _int_header(headers, "X-RateLimit-Reset")
+        if limit is not None:
+            self.limit = limit
+        if remaining is not None:
+            self.remaining = remaining
+        if reset_at is not None:
+            self.reset_at = float(reset_at)
+
+    def seconds_until_reset(self, now: float | None = None) -> float:
+        if self.reset_at is None:
+            return 0.0
+        current = time.time() if now is None else now
+        return max(0.0, self.reset_at - current)
+
+    def allows(self, min_remaining: int = 1, now: float | None = None) -> bool:
+        if self.remaining is None or self.remaining >= min_remaining:
+            return True
+        return self.seconds_until_reset(now) == 0.0
 
 
 class GitHubClient:
-    def __init__(self, token: str, username: str) -> None:
+    def __init__(
+        self,
+        token: str,
+        username: str,
+        http_cache: HttpCache | None = None,
+        api_mode: str = "rest",
+        api_url: str = DEFAULT_API_URL,
+        sleep: Callable[[float], None] = time.sleep,
+        owners: tuple[str, ...] = (),
+    ) -> None:
+        if api_mode not in {"rest", "graphql"}:
+            raise ValueError(f"Unsupported GitHub api_mode: {api_mode}")
         self._token = token
         self._username = username
-        self._owned_repos_cache: list[dict[str, Any]] | None = None
+        self._owners = owners
+        self._owner_logins = {login.lower() for login in (username, *owners)}
+        self._api_mode = api_mode
+        self._api_url = api_url.rstrip("/")
+        self._sleep = sleep
+        self._http_cache = http_cache
+        self._session = requests.Session()
+        self._owned_repos_cache: list[RepoRecord] | None = None
+        self.not_modified_count = 0
+        self.retry_count = 0
+        self.rate_limit = RateLimitBudget()
+
+    def has_budget(self, min_remaining: int = 1) -> bool:
+        """Whether at least ``min_remaining`` requests are left before the rate limit resets.
+
+        Returns True while the budget is still unknown (no request made yet).
+        """
+        return self.rate_limit.allows(min_remaining)
 
     def count_owned_repos(self) -> GitHubRepoCount:
         owned = self.list_owned_repos()
@@ -26,55 +219,262 @@ class GitHubClient:
         """Count non-archived repos owned by the user."""
         return len(self.list_active_repos())
 
-    def list_active_repos(self) -> list[dict[str, Any]]:
+    def list_active_repos(self) -> list[RepoRecord]:
         """Return non-archived repos owned by the user."""
         owned = self.list_owned_repos()
-        return [repo for repo in owned if not repo.get("archived", False)]
+        return [repo for repo in owned if not repo.archived]
 
-    def list_owned_repos(self) -> list[dict[str, Any]]:
+    def list_owned_repos(self) -> list[RepoRecord]:
         if self._owned_repos_cache is not None:
             return self._owned_repos_cache
 
-        repos: list[dict[str, Any]] = []
+        repos = [repo for page in self._iter_pages() for repo in page]
+        self._owned_repos_cache = [repo for repo in repos if self._is_owned(repo)]
+        return self._owned_repos_cache
+
+    def list_owned_repos_updated_since(self, since: str) -> list[RepoRecord]:
+        """Return owned repos whose ``updated_at`` is at or after ``since`` (ISO 8601), newest first.
+
+        Pages come sorted by update time, so fetching stops at the first older repo.
+        """
+        repos: list[RepoRecord] = []
+        for page in self._iter_pages():
+            for repo in page:
+                if repo.updated_at < since:
+                    return [repo for repo in repos if self._is_owned(repo)]
+                repos.append(repo)
+        return [repo for repo in repos if self._is_owned(repo)]
+
+    def _iter_pages(self) -> Iterator[list[RepoRecord]]:
+        """Yield pages of repos, most recently updated first."""
+        if self._api_mode == "graphql":
+            yield from self._iter_graphql_pages()
+        else:
+            yield from self._iter_rest_pages()
+
+    def _iter_rest_pages(self) -> Iterator[list[RepoRecord]]:
         page = 1
         while True:
             batch = self._fetch_page(page)
             if not batch:
-                break
-            repos.extend(batch)
+                return
+            records = [RepoRecord.from_api(repo) for repo in batch if isinstance(repo, dict)]
+            yield [self._with_parent(record) if record.fork else record for record in records]
             page += 1
 
-        self._owned_repos_cache = [repo for repo in repos if self._is_owned(repo)]
-        return self._owned_repos_cache
+    def _with_parent(self, fork: RepoRecord) -> RepoRecord:
+        """``fork`` with its parent id, which the /user/repos listing leaves out.
+
+        Forks are few, and the detail request is conditional against the HTTP cache.
+        """
+        if fork.parent_id is not None or not fork.owner_login:
+            return fork
+        data = self._get_json(f"{self._api_url}/repos/{fork.owner_login}/{fork.name}", {})
+        parent = data.get("parent") if isinstance(data, dict) else None
+        if not isinstance(parent, dict):
+            return fork
+        return replace(fork, parent_id=parent.get("id"))
+
+    def _iter_graphql_pages(self) -> Iterator[list[RepoRecord]]:
+        cursor: str | None = None
+        while True:
+            connection = self._fetch_graphql_page(cursor)
+            nodes = connection.get("nodes") or []
+            yield [RepoRecord.from_graphql(node) for node in nodes if isinstance(node, dict)]
+            page_info = connection.get("pageInfo") or {}
+            if not page_info.get("hasNextPage"):
+                return
+            cursor = page_info.get("endCursor")
+
+    def _fetch_graphql_page(self, cursor: str | None) -> dict[str, Any]:
+        response = self._request(
+            "POST",
+            f"{self._api_url}/graphql",
+            headers=self._headers(),
+            json={
+                "query": OWNED_REPOS_QUERY,
+                "variables": {
+                    "cursor": cursor,
+                    "affiliations": ["OWNER", "ORGANIZATION_MEMBER"] if self._owners else ["OWNER"],
+                },
+            },
+            timeout=20,
+        )
+        if response.status_code >= 400:
+            raise RuntimeError(
+                f"GitHub API error {response.status_code}: {response.text.strip()}"
+            )
+        data = response.json()
+        if not isinstance(data, dict):
+            raise RuntimeError("Unexpected GitHub GraphQL response")
+        if data.get("errors"):
+            messages = "; ".join(str(error.get("message", error)) for error in data["errors"])
+            raise RuntimeError(f"GitHub GraphQL error: {messages}")
+        try:
+            connection = data["data"]["viewer"]["repositories"]
+        except (KeyError, TypeError):
+            raise RuntimeError("Unexpected GitHub GraphQL response") from None
+        if not isinstance(connection, dict):
+            raise RuntimeError("Unexpected GitHub GraphQL response")
+        return connection
 
     def _fetch_page(self, page: int) -> list[dict[str, Any]]:
-        url = "https://api.github.com/user/repos"
-        headers = {
-            "Accept": "application/vnd.github+json",
-            "Authorization": f"Bearer {self._token}",
-            "X-GitHub-Api-Version": "2022-11-28",
-            "User-Agent": "automations",
-        }
-        params = {
+        url = f"{self._api_url}/user/repos"
+        params: dict[str, Any] = {
             "per_page": 100,
             "page": page,
-            "type": "owner",
+            "sort": "updated",
+            "direction": "desc",
         }
-        response = requests.get(url, headers=headers, params=params, timeout=20)
+        # `type` and `affiliation` are mutually exclusive; org repos need the latter.
+        if self._owners:
+            params["affiliation"] = "owner,organization_member"
+        else:
+            params["type"] = "owner"
+        data = self._get_json(url, params)
+        if not isinstance(data, list):
+            raise RuntimeError("Unexpected GitHub API response")
+        return data
+
+    def _get_json(self, url: str, params: dict[str, Any]) -> Any:
+        """GET a JSON resource, revalidating against the on-disk cache when one is configured.
+
+        A 304 answer is served from the cache and does not count against the rate limit.
+        """
+        headers = self._headers()
+        cached = self._http_cache.get(url, params) if self._http_cache else None
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        response = self._request("GET", url, headers=headers, params=params, timeout=20)
+        if response.status_code == 304 and cached is not None:
+            self.not_modified_count += 1
+            return cached.body
         if response.status_code >= 400:
             raise RuntimeError(
                 f"GitHub API error {response.status_code}: {response.text.strip()}"
             )
         data = response.json()
-        if not isinstance(data, list):
-            raise RuntimeError("Unexpected GitHub API response")
+        if self._http_cache is not None:
+            self._http_cache.put(
+                url,
+                params,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                body=data,
+            )
         return data
 
-    def _is_owned(self, repo: dict[str, Any]) -> bool:
-        owner = repo.get("owner")
-        if not isinstance(owner, dict):
-            return False
-        login = owner.get("login")
-        if not isinstance(login, str):
+    def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request, retrying 5xx and rate-limited answers with jittered exponential backoff."""
+        attempt = 0
+        while True:
+            try:
+                response = self._session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= MAX_RETRIES:
+                    raise
+                self._backoff(attempt, None)
+                attempt += 1
+                continue
+
+            self.rate_limit.update(response.headers)
+            if not self._is_retryable(response) or attempt >= MAX_RETRIES:
+                return response
+            self._backoff(attempt, response)
+            attempt += 1
+
+    def _is_retryable(self, response: requests.Response) -> bool:
+        if response.status_code >= 500 or response.status_code == 429:
+            return True
+        if response.status_code != 403:
             return False
-        return login.lower() == self._username.lower()
+        if "Retry-After" in response.headers:
+            return True
+        if _int_header(response.headers, "X-RateLimit-Remaining") == 0:
+            return True
+        return "rate limit" in response.text.lower()
+
+    def _backoff(self, attempt: int, response: requests.Response | None) -> None:
+        delay: float | None = None
+        if response is not None:
+            retry_after = _int_header(response.headers, "Retry-After")
+            if retry_after is not None:
+                delay = float(retry_after)
+            elif _int_header(response.headers, "X-RateLimit-Remaining") == 0:
+                delay = self.rate_limit.seconds_until_reset()
+        if delay is None:
+            ceiling = min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)
+            delay = random.uniform(0, ceiling)
+        if delay > MAX_RATE_LIMIT_WAIT_SECONDS:
+            raise RuntimeError(
+                f"GitHub rate limit exhausted; retry in {int(delay)}s"
+            )
+        self.retry_count += 1
+        self._sleep(delay)
+
+    def _headers(self) -> dict[str, str]:
+        return {
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {self._token}",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "User-Agent": "automations",
+        }
+
+    def _is_owned(self, repo: RepoRecord) -> bool:
+        return repo.owner_login.lower() in self._owner_logins
+
+
+def _int_header(headers: Any, name: str) -> int | None:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
+
+
+def _intern(value: Any) -> str:
+    """Intern short repeated strings (owner logins, names, timestamps) shared across records."""
+    return sys.intern(str(value)) if value else ""
+
+
+def resolve_github_identities(settings: dict[str, Any], service_cfg: dict[str, Any]) -> list[GitHubIdentity]:
+    """Collect the configured GitHub identities.
+
+    The primary account comes from ``github_username``/``github_token`` (or the ``github``
+    service config) plus optional ``github_owners``; ``github_accounts`` adds further ones.
+    """
+    identities: list[GitHubIdentity] = []
+    username = settings.get("github_username") or service_cfg.get("username")
+    token = settings.get("github_token") or service_cfg.get("token")
+    if username and token:
+        owners = settings.get("github_owners") or service_cfg.get("owners") or []
+        identities.append(GitHubIdentity(str(username), str(token), _owner_tuple(owners)))
+
+    accounts = settings.get("github_accounts") or []
+    if not isinstance(accounts, list):
+        raise ValueError("github_accounts must be a list")
+    for account in accounts:
+        if not isinstance(account, dict):
+            raise ValueError("github_accounts entries must be mappings")
+        if not account.get("username") or not account.get("token"):
+            raise ValueError("github_accounts entries need username and token")
+        identity = GitHubIdentity(
+            str(account["username"]),
+            str(account["token"]),
+            _owner_tuple(account.get("owners") or []),
+        )
+        if identity not in identities:
+            identities.append(identity)
+    return identities
+
+
+def _owner_tuple(raw: Any) -> tuple[str, ...]:
+    if isinstance(raw, str):
+        raw = [raw]
+    return tuple(sorted({str(owner) for owner in raw if owner}))
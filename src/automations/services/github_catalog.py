@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .github import GitHubIdentity, RepoRecord
+from .github_mirror import GitHubRepoMirror, MirrorSync
+
+
+@dataclass(frozen=True)
+class RepoCatalog:
+    """Owned repos merged across every configured GitHub identity."""
+
+    repos: list[RepoRecord]
+    syncs: dict[str, MirrorSync]
+
+    def active_repos(self) -> list[RepoRecord]:
+        return [repo for repo in self.repos if not repo.archived]
+
+
+def build_catalog(
+    mirrors: dict[GitHubIdentity, GitHubRepoMirror],
+    full_refresh: bool = False,
+) -> RepoCatalog:
+    """Sync all mirrors concurrently and merge their repos into one catalogue."""
+    if not mirrors:
+        return RepoCatalog(repos=[], syncs={})
+
+    def sync(identity: GitHubIdentity) -> tuple[MirrorSync, list[RepoRecord]]:
+        mirror = mirrors[identity]
+        return mirror.sync(full=full_refresh), mirror.list_owned_repos()
+
+    with ThreadPoolExecutor(max_workers=len(mirrors)) as pool:
+        results = dict(zip(mirrors, pool.map(sync, mirrors)))
+
+    syncs = {identity.label: result[0] for identity, result in results.items()}
+    repos = merge_repo_records([result[1] for result in results.values()])
+    return RepoCatalog(repos=repos, syncs=syncs)
+
+
+def merge_repo_records(groups: list[list[RepoRecord]]) -> list[RepoRecord]:
+    """Merge repo listings, collapsing transfers and forks of tracked repos.
+
+    A repo transferred between tracked owners shows up under the same id in both
+    listings; the most recently updated copy wins. A fork is dropped when its parent
+    is one of the tracked repos.
+    """
+    by_key: dict[str, RepoRecord] = {}
+    for group in groups:
+        for repo in group:
+            key = str(repo.id) if repo.id is not None else f"{repo.owner_login.lower()}/{repo.name}"
+            current = by_key.get(key)
+            if current is None or repo.updated_at > current.updated_at:
+                by_key[key] = repo
+
+    tracked_ids = {repo.id for repo in by_key.values() if repo.id is not None}
+    merged = [
+        repo for repo in by_key.values()
+        if not (repo.fork and repo.parent_id in tracked_ids)
+    ]
+    return sorted(merged, key=lambda repo: (repo.name.lower(), repo.owner_login.lower()))
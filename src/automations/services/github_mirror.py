@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from pathlib import Path
+
+import requests
+
+from ..output_writer import write_json_atomic
+from .github import GitHubClient, RepoRecord
+
+MIRROR_VERSION = 4
+# Requests that must be left in the rate-limit budget before a sync is attempted.
+MIN_SYNC_BUDGET = 10
+
+
+@dataclass(frozen=True)
+class MirrorSync:
+    full: bool
+    fetched: int
+    total: int
+    skipped: bool = False
+    error: str | None = None  # set when a failed sync fell back to the stored mirror
+
+
+class GitHubRepoMirror:
+    """Persisted copy of owned repo metadata, kept current with incremental syncs.
+
+    A delta sync asks for repos sorted by update time and stops at the first repo older
+    than the newest ``updated_at`` already mirrored. Deleted repos are only dropped by a
+    full refresh.
+    """
+
+    def __init__(self, client: GitHubClient, path: Path | None) -> None:
+        self._client = client
+        self._path = path
+        self._repos: dict[str, RepoRecord] | None = None
+        self._watermark = ""
+        self._last_sync: MirrorSync | None = None
+
+    @property
+    def last_sync(self) -> MirrorSync | None:
+        return self._last_sync
+
+    def sync(self, full: bool = False) -> MirrorSync:
+        """Bring the mirror up to date; at most one delta sync runs per process.
+
+        A sync that fails while a stored mirror exists returns it as ``skipped`` instead
+        of raising; the failure is remembered so later calls in the run do not retry.
+        """
+        if self._last_sync is not None and (self._last_sync.full or self._last_sync.error or not full):
+            return self._last_sync
+
+        repos = self._load()
+        if repos and not self._client.has_budget(MIN_SYNC_BUDGET):
+            self._last_sync = MirrorSync(full=False, fetched=0, total=len(repos), skipped=True)
+            return self._last_sync
+
+        full = full or not repos or not self._watermark
+        try:
+            if full:
+                fetched = self._client.list_owned_repos()
+            else:
+                fetched = self._client.list_owned_repos_updated_since(self._watermark)
+        except (requests.RequestException, RuntimeError) as e:
+            if not repos:
+                raise
+            # Offline or GitHub failing: serve the stored mirror, and do not retry this run
+            self._last_sync = MirrorSync(
+                full=False,
+                fetched=0,
+                total=len(repos),
+                skipped=True,
+                error=f"{type(e).__name__}: {e}",
+            )
+            return self._last_sync
+        if full:
+            repos = {_repo_key(repo): repo for repo in fetched}
+        else:
+            for repo in fetched:
+                repos[_repo_key(repo)] = repo
+
+        self._repos = repos
+        self._watermark = max((repo.updated_at for repo in repos.values()), default="")
+        self._save()
+        self._last_sync = MirrorSync(full=full, fetched=len(fetched), total=len(repos))
+        return self._last_sync
+
+    def list_owned_repos(self) -> list[RepoRecord]:
+        self.sync()
+        repos = self._repos or {}
+        return sorted(repos.values(), key=lambda repo: repo.name.lower())
+
+    def list_active_repos(self) -> list[RepoRecord]:
+        return [repo for repo in self.list_owned_repos() if not repo.archived]
+
+    def _load(self) -> dict[str, RepoRecord]:
+        if self._repos is not None:
+            return self._repos
+        self._repos = {}
+        if self._path is None or not self._path.exists():
+            return self._repos
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return self._repos
+        if not isinstance(data, dict) or data.get("version") != MIRROR_VERSION:
+            return self._repos
+        repos = data.get("repos")
+        if isinstance(repos, list):
+            self._repos = {
+                _repo_key(record): record
+                for record in (RepoRecord.from_api(repo) for repo in repos if isinstance(repo, dict))
+            }
+        self._watermark = str(data.get("watermark") or "")
+        return self._repos
+
+    def _save(self) -> None:
+        if self._path is None:
+            return
+        data = {
+            "version": MIRROR_VERSION,
+            "watermark": self._watermark,
+            "repos": [repo.to_dict() for repo in (self._repos or {}).values()],
+        }
+        write_json_atomic(self._path, data)
+
+
+def _repo_key(repo: RepoRecord) -> str:
+    return str(repo.id) if repo.id is not None else repo.name
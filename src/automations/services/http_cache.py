@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from ..output_writer import write_json_atomic
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    etag: str | None
+    last_modified: str | None
+    body: Any
+
+
+class HttpCache:
+    """On-disk store of GET response bodies and their validators, keyed by URL and params."""
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+
+    def get(self, url: str, params: dict[str, Any] | None = None) -> CachedResponse | None:
+        path = self._entry_path(url, params)
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return None
+        if not isinstance(data, dict) or "body" not in data:
+            return None
+        return CachedResponse(
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+            body=data["body"],
+        )
+
+    def put(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        etag: str | None,
+        last_modified: str | None,
+        body: Any,
+    ) -> None:
+        if not etag and not last_modified:
+            return
+        path = self._entry_path(url, params)
+        entry = {
+            "url": url,
+            "params": params or {},
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body,
+        }
+        write_json_atomic(path, entry)
+
+    def _entry_path(self, url: str, params: dict[str, Any] | None) -> Path:
+        key = json.dumps([url, sorted((params or {}).items())], default=str)
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self._root / f"{digest}.json"
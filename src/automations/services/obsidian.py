@@ -1,6 +1,119 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+import hashlib
+import os
 from pathlib import Path
+import re
+from typing import Any, Callable
+
+# ![[target#heading|alias]] / [[target|alias]]
+WIKILINK_RE = re.compile(r"(!?)\[\[([^\]|#]*)(#[^\]|]*)?(?:\|([^\]]*))?\]\]")
+HEADING_RE = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class WikiLink:
+    embed: bool
+    target: str  # note or file name as written, without heading
+    heading: str  # "" when the link has no #heading
+    alias: str  # "" when the link has no |alias
+
+    @property
+    def label(self) -> str:
+        return self.alias or self.target or self.heading
+
+
+def parse_wikilinks(text: str) -> list[WikiLink]:
+    return [_wikilink(match) for match in WIKILINK_RE.finditer(text)]
+
+
+def replace_wikilinks(text: str, replace: Callable[[WikiLink], str]) -> str:
+    """Substitute every wikilink/embed in ``text`` with ``replace(WikiLink)``."""
+    return WIKILINK_RE.sub(lambda match: replace(_wikilink(match)), text)
+
+
+def _wikilink(match: re.Match[str]) -> WikiLink:
+    return WikiLink(
+        embed=match.group(1) == "!",
+        target=match.group(2).strip(),
+        heading=(match.group(3) or "").lstrip("#").strip(),
+        alias=(match.group(4) or "").strip(),
+    )
+
+
+def read_frontmatter(path: Path) -> str:
+    """The YAML frontmatter block of a note, read line by line; "" when there is none."""
+    with path.open(encoding="utf-8", errors="replace") as handle:
+        if handle.readline().rstrip("\r\n") != "---":
+            return ""
+        lines = []
+        for line in handle:
+            if line.rstrip("\r\n") == "---":
+                return "".join(lines)
+            lines.append(line)
+    return ""
+
+
+def strip_frontmatter(text: str) -> str:
+    if not text.startswith("---"):
+        return text
+    lines = text.splitlines(keepends=True)
+    if lines[0].rstrip("\r\n") != "---":
+        return text
+    for index, line in enumerate(lines[1:], start=1):
+        if line.rstrip("\r\n") == "---":
+            return "".join(lines[index + 1:])
+    return text
+
+
+def scan_notes(vault_path: Path, include: str, known: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Per top-level note: whether its frontmatter contains ``include`` and, if so, its
+    content hash, title, links and embeds.
+
+    ``known`` is a previous result; notes whose size and mtime are unchanged are taken
+    from it without being opened.
+    """
+    if not vault_path.is_dir():
+        raise FileNotFoundError(f"Obsidian vault path does not exist: {vault_path}")
+    notes: dict[str, dict[str, Any]] = {}
+    for path in vault_path.glob("*.md"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        key = str(path)
+        previous = known.get(key)
+        if previous and previous.get("mtime_ns") == stat.st_mtime_ns and previous.get("size") == stat.st_size:
+            notes[key] = previous
+            continue
+        info: dict[str, Any] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "selected": False}
+        # Only the frontmatter is read for notes that are not selected
+        if include in read_frontmatter(path):
+            text = path.read_text(encoding="utf-8")
+            wikilinks = parse_wikilinks(text)
+            heading = HEADING_RE.search(text)
+            info.update(
+                selected=True,
+                sha256=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+                title=heading.group(1).strip() if heading else path.stem,
+                links=sorted({link.target.lower() for link in wikilinks if not link.embed and link.target}),
+                embeds=sorted({link.target.lower() for link in wikilinks if link.embed and link.target}),
+            )
+        notes[key] = info
+    return notes
+
+
+def index_media(vault_media: Path) -> dict[str, Path]:
+    """Lower-cased file name → path for every non-note file in the media folder."""
+    if not vault_media.is_dir():
+        return {}
+    index: dict[str, Path] = {}
+    with os.scandir(vault_media) as it:
+        for item in it:
+            if item.is_file() and not item.name.endswith(".md"):
+                index[item.name.lower()] = Path(item.path)
+    return index
 
 
 def count_markdown_files(vault_path: Path) -> int:
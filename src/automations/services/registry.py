@@ -1,21 +1,72 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Any
 
-from .github import GitHubClient
+from .browser import HeadlessBrowser
+from .github import DEFAULT_API_URL, GitHubClient, GitHubIdentity
+from .github_catalog import RepoCatalog, build_catalog
+from .github_mirror import GitHubRepoMirror
+from .http_cache import HttpCache
 
 
 class ServiceRegistry:
-    def __init__(self, services_config: dict[str, Any]) -> None:
+    def __init__(self, services_config: dict[str, Any], cache_root: Path | None = None) -> None:
         self._config = services_config
-        self._github_clients: dict[tuple[str, str], GitHubClient] = {}
+        self._cache_root = cache_root
+        self._github_clients: dict[tuple[str, str, tuple[str, ...]], GitHubClient] = {}
+        self._github_mirrors: dict[tuple[str, str, tuple[str, ...]], GitHubRepoMirror] = {}
+        self._browser: HeadlessBrowser | None = None
 
-    def github_client(self, username: str, token: str) -> GitHubClient:
-        key = (username, token)
+    def github_client(self, username: str, token: str, owners: tuple[str, ...] = ()) -> GitHubClient:
+        key = (username, token, owners)
         if key not in self._github_clients:
-            self._github_clients[key] = GitHubClient(token=token, username=username)
+            http_cache = None
+            if self._cache_root is not None:
+                http_cache = HttpCache(self._cache_root / "github" / "http" / username.lower())
+            github_cfg = self.service_config("github")
+            self._github_clients[key] = GitHubClient(
+                token=token,
+                username=username,
+                http_cache=http_cache,
+                api_mode=str(github_cfg.get("api_mode", "rest")),
+                api_url=str(github_cfg.get("api_url", DEFAULT_API_URL)),
+                owners=owners,
+            )
         return self._github_clients[key]
 
+    def github_mirror(self, username: str, token: str, owners: tuple[str, ...] = ()) -> GitHubRepoMirror:
+        key = (username, token, owners)
+        if key not in self._github_mirrors:
+            path = None
+            if self._cache_root is not None:
+                label = GitHubIdentity(username, token, owners).label.lower()
+                path = self._cache_root / "github" / "mirror" / f"{label}.json"
+            client = self.github_client(username, token, owners)
+            self._github_mirrors[key] = GitHubRepoMirror(client, path)
+        return self._github_mirrors[key]
+
+    def github_catalog(self, identities: list[GitHubIdentity], full_refresh: bool = False) -> RepoCatalog:
+        """Owned repos of all identities, synced concurrently and merged."""
+        mirrors = {
+            identity: self.github_mirror(identity.username, identity.token, identity.owners)
+            for identity in identities
+        }
+        return build_catalog(mirrors, full_refresh=full_refresh)
+
+    def browser(self) -> HeadlessBrowser:
+        """The shared headless chromium; its profile and state live under the cache root."""
+        if self._browser is None:
+            if self._cache_root is None:
+                raise RuntimeError("The headless browser needs a cache root for its profile")
+            browser_cfg = self.service_config("browser")
+            self._browser = HeadlessBrowser(
+                binary=browser_cfg.get("binary") or None,
+                profile_dir=self._cache_root / "browser" / "profile",
+                state_path=self._cache_root / "browser.json",
+            )
+        return self._browser
+
     def service_config(self, name: str) -> dict[str, Any]:
         raw = self._config.get(name, {})
         return raw if isinstance(raw, dict) else {}
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+import gzip
+import json
+from pathlib import Path
+from typing import Any
+
+from .models import AutomationResult, RunSummary
+from .output_writer import atomic_path
+
+SNAPSHOT_VERSION = 1
+DEFAULT_KEEP = 30
+
+
+@dataclass(frozen=True)
+class Fallback:
+    run_id: str  # run whose automation produced the payload
+    payload: dict[str, Any]
+
+
+class SnapshotStore:
+    """Compact record of each run's automation results, in ``<run_id>.json.gz`` files.
+
+    A snapshot is enough to rebuild the dashboard without running anything, and gives
+    later runs a last known payload for automations that fail.
+    """
+
+    def __init__(self, root: Path, keep: int = DEFAULT_KEEP) -> None:
+        self.root = root
+        self.keep = keep
+
+    def save(self, run_id: str, summary: RunSummary, fallbacks: dict[str, Fallback] | None = None) -> Path:
+        """Write the snapshot of a run; ``fallbacks`` are the payloads used for failed automations."""
+        fallbacks = fallbacks or {}
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "run_id": run_id,
+            "saved_at": datetime.now().isoformat(timespec="seconds"),
+            "report_path": summary.report_path,
+            "warnings": list(summary.warnings),
+            "results": [_result_to_dict(result, fallbacks.get(result.automation_id)) for result in summary.results],
+        }
+        encoded = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        path = self.root / f"{run_id}.json.gz"
+        with atomic_path(path) as tmp_path:
+            tmp_path.write_bytes(gzip.compress(encoded, compresslevel=6))
+        self._prune()
+        return path
+
+    def run_ids(self) -> list[str]:
+        """Run ids with a snapshot, oldest first (run ids sort chronologically)."""
+        if not self.root.is_dir():
+            return []
+        return sorted(path.name.removesuffix(".json.gz") for path in self.root.glob("*.json.gz"))
+
+    def load(self, run_id: str | None = None) -> dict[str, Any] | None:
+        """The snapshot of ``run_id``, or of the latest run; None when there is none."""
+        if run_id is None:
+            run_ids = self.run_ids()
+            if not run_ids:
+                return None
+            run_id = run_ids[-1]
+        try:
+            data = json.loads(gzip.decompress((self.root / f"{run_id}.json.gz").read_bytes()))
+        except (FileNotFoundError, OSError, EOFError, json.JSONDecodeError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+            return None
+        return data
+
+    def results(self, snapshot: dict[str, Any]) -> list[AutomationResult]:
+        return [_result_from_dict(raw) for raw in snapshot.get("results", [])]
+
+    def fallbacks(self) -> dict[str, Fallback]:
+        """Last known good payload per automation, from the latest snapshot.
+
+        Automations that failed in that run contribute the fallback they used then, so
+        a payload (and the run it came from) survives several failed runs in a row.
+        """
+        snapshot = self.load()
+        if snapshot is None:
+            return {}
+        return {
+            automation_id: fallback
+            for automation_id, fallback in snapshot_fallbacks(snapshot, include_ok=True).items()
+            if fallback.payload
+        }
+
+    def _prune(self) -> None:
+        for run_id in self.run_ids()[:-self.keep] if self.keep > 0 else []:
+            (self.root / f"{run_id}.json.gz").unlink(missing_ok=True)
+
+
+def snapshot_fallbacks(snapshot: dict[str, Any], include_ok: bool = False) -> dict[str, Fallback]:
+    """Fallbacks recorded for the failed automations of a snapshot, plus its ok payloads."""
+    fallbacks: dict[str, Fallback] = {}
+    for raw in snapshot.get("results", []):
+        if raw.get("status") == "ok":
+            if include_ok and isinstance(raw.get("payload"), dict):
+                fallbacks[raw["automation_id"]] = Fallback(snapshot["run_id"], raw["payload"])
+            continue
+        fallback = raw.get("fallback")
+        if isinstance(fallback, dict) and isinstance(fallback.get("payload"), dict):
+            fallbacks[raw["automation_id"]] = Fallback(str(fallback.get("run_id")), fallback["payload"])
+    return fallbacks
+
+
+def _result_to_dict(result: AutomationResult, fallback: Fallback | None) -> dict[str, Any]:
+    data: dict[str, Any] = {
+        "automation_id": result.automation_id,
+        "status": result.status,
+        "payload": result.payload,
+        "message": result.message,
+        "started_at": result.started_at.isoformat() if result.started_at else None,
+        "finished_at": result.finished_at.isoformat() if result.finished_at else None,
+    }
+    if fallback is not None:
+        data["fallback"] = {"run_id": fallback.run_id, "payload": fallback.payload}
+    return data
+
+
+def _result_from_dict(raw: dict[str, Any]) -> AutomationResult:
+    return AutomationResult(
+        automation_id=raw["automation_id"],
+        status=raw["status"],
+        payload=raw.get("payload") or {},
+        message=raw.get("message"),
+        started_at=datetime.fromisoformat(raw["started_at"]) if raw.get("started_at") else None,
+        finished_at=datetime.fromisoformat(raw["finished_at"]) if raw.get("finished_at") else None,
+    )
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+import pytest
+
+from stub_server import StubServer
+
+
+@pytest.fixture
+def stub() -> Iterator[StubServer]:
+    with StubServer() as server:
+        yield server
@@ -0,0 +1,129 @@
+"""Scripted local HTTP server for exercising API clients offline.
+
+Every request is recorded and answered with the next queued response, or with a
+``200 {"ok": true}`` once the queue is empty. Run it directly to give
+``telegram_api_base`` something local to deliver to:
+
+    python tests/stub_server.py --port 8766
+"""
+from __future__ import annotations
+
+import argparse
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+from typing import Any
+
+
+@dataclass(frozen=True)
+class StubResponse:
+    status: int
+    body: Any = None
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class StubRequest:
+    method: str
+    path: str
+    headers: dict[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class StubServer:
+    """An HTTP server on 127.0.0.1 that replays queued responses from a background thread."""
+
+    def __init__(self, port: int = 0) -> None:
+        self.requests: list[StubRequest] = []
+        self._responses: deque[StubResponse] = deque()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _handler_for(self))
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-server", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def queue(self, status: int, body: Any = None, headers: dict[str, str] | None = None) -> None:
+        with self._lock:
+            self._responses.append(StubResponse(status, body, headers or {}))
+
+    def start(self) -> StubServer:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> StubServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _answer(self, request: StubRequest) -> StubResponse:
+        with self._lock:
+            self.requests.append(request)
+            if self._responses:
+                return self._responses.popleft()
+        return StubResponse(200, {"ok": True})
+
+
+def _handler_for(stub: StubServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            self._handle()
+
+        def do_POST(self) -> None:
+            self._handle()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            return
+
+        def _handle(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            request = StubRequest(
+                method=self.command,
+                path=self.path,
+                headers=dict(self.headers.items()),
+                body=self.rfile.read(length) if length else b"",
+            )
+            response = stub._answer(request)
+            payload = b"" if response.body is None else json.dumps(response.body).encode("utf-8")
+            self.send_response(response.status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in response.headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Answer every request with 200 and print it.")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+    stub = StubServer(args.port).start()
+    print(f"Stub server listening on {stub.url}")
+    seen = 0
+    try:
+        while True:
+            stub._thread.join(0.5)
+            for request in stub.requests[seen:]:
+                print(request.method, request.path, request.body.decode("utf-8", errors="replace"))
+            seen = len(stub.requests)
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from automations.services.github import GitHubClient, RepoRecord
+from automations.services.github_catalog import merge_repo_records
+
+
+def _repo(id: int, name: str, owner: str, *, parent_id: int | None = None) -> RepoRecord:
+    return RepoRecord.from_api({
+        "id": id,
+        "name": name,
+        "owner": {"login": owner},
+        "fork": parent_id is not None,
+        "parent": {"id": parent_id} if parent_id is not None else None,
+        "updated_at": "2026-01-01T00:00:00Z",
+    })
+
+
+def test_drops_only_forks_of_tracked_repos():
+    source = _repo(1, "tool", "octo")
+    own_fork = _repo(2, "tool", "octo-org", parent_id=1)
+    upstream_fork = _repo(3, "tool", "octo-org", parent_id=99)
+
+    merged = merge_repo_records([[source], [own_fork, upstream_fork]])
+
+    assert [repo.id for repo in merged] == [1, 3]
+
+
+def test_rest_listing_fills_in_fork_parent(stub):
+    stub.queue(200, [{"id": 2, "name": "tool", "fork": True, "owner": {"login": "octo"}}])
+    stub.queue(200, {"id": 2, "name": "tool", "parent": {"id": 1}})
+    stub.queue(200, [])  # end of pagination
+    client = GitHubClient(token="token", username="octo", api_url=stub.url, sleep=lambda _: None)
+
+    repos = client.list_owned_repos()
+
+    assert [repo.parent_id for repo in repos] == [1]
+    assert stub.requests[1].path == "/repos/octo/tool"
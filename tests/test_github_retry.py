@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from automations.services import github
+from automations.services.github import GitHubClient
+
+
+def _client(stub, sleeps: list[float]) -> GitHubClient:
+    return GitHubClient(token="token", username="octo", api_url=stub.url, sleep=sleeps.append)
+
+
+def test_retries_502_with_jittered_backoff(stub):
+    stub.queue(502, {"message": "Bad Gateway"})
+    stub.queue(502, {"message": "Bad Gateway"})
+    stub.queue(200, [{"name": "repo", "owner": {"login": "octo"}}])
+    stub.queue(200, [])  # end of pagination
+    sleeps: list[float] = []
+    client = _client(stub, sleeps)
+
+    repos = client.list_owned_repos()
+
+    assert [repo.name for repo in repos] == ["repo"]
+    assert len(stub.requests) == 4
+    assert client.retry_count == 2
+    assert 0 <= sleeps[0] <= github.BACKOFF_BASE_SECONDS
+    assert 0 <= sleeps[1] <= github.BACKOFF_BASE_SECONDS * 2
+
+
+def test_gives_up_after_max_retries(stub):
+    for _ in range(github.MAX_RETRIES + 1):
+        stub.queue(502)
+    sleeps: list[float] = []
+    client = _client(stub, sleeps)
+
+    response = client._request("GET", f"{stub.url}/user/repos", timeout=5)
+
+    assert response.status_code == 502
+    assert len(stub.requests) == github.MAX_RETRIES + 1
+    assert len(sleeps) == github.MAX_RETRIES
+
+
+def test_403_waits_for_retry_after(stub):
+    stub.queue(403, {"message": "secondary rate limit"}, {"Retry-After": "7"})
+    stub.queue(200, [])
+    sleeps: list[float] = []
+    client = _client(stub, sleeps)
+
+    response = client._request("GET", f"{stub.url}/user/repos", timeout=5)
+
+    assert response.status_code == 200
+    assert sleeps == [7.0]
+
+
+def test_exhausted_rate_limit_waits_until_reset(stub):
+    reset_at = int(time.time()) + 20
+    stub.queue(403, {"message": "API rate limit exceeded"}, {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": str(reset_at),
+    })
+    stub.queue(200, [], {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4999"})
+    sleeps: list[float] = []
+    client = _client(stub, sleeps)
+
+    response = client._request("GET", f"{stub.url}/user/repos", timeout=5)
+
+    assert response.status_code == 200
+    assert len(sleeps) == 1
+    assert 18 <= sleeps[0] <= 20
+    assert client.rate_limit.remaining == 4999
+
+
+def test_exhausted_rate_limit_with_distant_reset_raises(stub):
+    reset_at = int(time.time()) + 3600
+    stub.queue(403, {"message": "API rate limit exceeded"}, {
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": str(reset_at),
+    })
+    sleeps: list[float] = []
+    client = _client(stub, sleeps)
+
+    with pytest.raises(RuntimeError, match="rate limit exhausted"):
+        client._request("GET", f"{stub.url}/user/repos", timeout=5)
+    assert sleeps == []
+    assert len(stub.requests) == 1
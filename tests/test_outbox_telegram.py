@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+from automations import outbox as outbox_module
+from automations.config import AppConfig, ReportConfig
+from automations.logging.log_writer import LogWriter
+from automations.outbox import Outbox, OutboxWorker, default_handlers
+
+
+def _config(tmp_path: Path, api_base: str) -> AppConfig:
+    return AppConfig(
+        project_root=tmp_path,
+        report=ReportConfig(screen_width=2560, screen_height=1600),
+        services={},
+        settings={"telegram_bot_token": "123:abc", "telegram_api_base": api_base},
+    )
+
+
+def _deliver(tmp_path: Path, api_base: str, outbox: Outbox) -> None:
+    log = LogWriter(tmp_path / "logs", date.today(), "test")
+    worker = OutboxWorker(outbox, default_handlers(_config(tmp_path, api_base)), log)
+    worker.start()
+    worker.finish(timeout=10)
+
+
+def test_telegram_message_is_delivered(tmp_path, stub):
+    outbox = Outbox(tmp_path / "outbox")
+    outbox.enqueue("telegram_message", {"chat_id": "42", "text": "hello"})
+
+    _deliver(tmp_path, stub.url, outbox)
+
+    assert [request.path for request in stub.requests] == ["/bot123:abc/sendMessage"]
+    assert stub.requests[0].json() == {"chat_id": "42", "text": "hello"}
+    assert outbox.stats.delivered == 1
+    assert outbox.pending() == []
+    # The bot token is only used at delivery time, never stored
+    assert "123:abc" not in (tmp_path / "outbox" / "outbox.jsonl").read_text(encoding="utf-8")
+
+
+def test_failed_delivery_is_retried(tmp_path, stub, monkeypatch):
+    monkeypatch.setattr(outbox_module, "RETRY_DELAY_S", 0.01)
+    stub.queue(502, {"ok": False})
+    outbox = Outbox(tmp_path / "outbox")
+    outbox.enqueue("telegram_message", {"chat_id": "42", "text": "hello"})
+
+    _deliver(tmp_path, stub.url, outbox)
+
+    assert len(stub.requests) == 2
+    assert outbox.stats.delivered == 1
+
+
+def test_undelivered_message_stays_queued_for_the_next_run(tmp_path, stub, monkeypatch):
+    monkeypatch.setattr(outbox_module, "RETRY_DELAY_S", 0.01)
+    for _ in range(outbox_module.RUN_ATTEMPTS):
+        stub.queue(502, {"ok": False})
+    outbox = Outbox(tmp_path / "outbox")
+    outbox.enqueue("telegram_message", {"chat_id": "42", "text": "hello"})
+
+    _deliver(tmp_path, stub.url, outbox)
+
+    assert len(stub.requests) == outbox_module.RUN_ATTEMPTS
+    next_run = Outbox(tmp_path / "outbox")
+    [item] = next_run.pending()
+    assert item.attempts == outbox_module.RUN_ATTEMPTS
+    assert "502" in (item.error or "")
+
+    _deliver(tmp_path, stub.url, next_run)
+
+    assert next_run.pending() == []
+    assert next_run.stats.delivered == 1